@@ -2,43 +2,113 @@
 Database migration script for multi-bot support
 Run this script to migrate your existing database to support multiple bots
 """
+import logging
 import sqlite3
 import os
 from pathlib import Path
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "geodine.db")
 
+logger = logging.getLogger(__name__)
+
+
+def _rebuild_users_table(conn, cursor, default_bot_id):
+    """
+    Rebuild the users table to add the bot_id column (fallback for SQLite
+    versions that predate in-place ALTER TABLE support).
+    """
+    # Create new users table. The (bot_id, line_user_id) uniqueness is
+    # enforced via an index created after the bulk copy, so inserted
+    # rows don't re-balance a secondary index during the copy.
+    cursor.execute('''
+    CREATE TABLE users_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bot_id INTEGER NOT NULL,
+        line_user_id TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (bot_id) REFERENCES bots(id)
+    )
+    ''')
+
+    # Copy existing users to new table with default bot_id.
+    # Small tables use SQLite's fast single-statement transfer path;
+    # large tables are copied in chunks via executemany so the copy
+    # doesn't materialize everything at once.
+    cursor.execute("SELECT COUNT(*) FROM users")
+    user_count = cursor.fetchone()[0]
+
+    if user_count < 100_000:
+        cursor.execute(f'''
+        INSERT INTO users_new (id, bot_id, line_user_id, created_at)
+        SELECT id, {default_bot_id}, line_user_id, created_at FROM users
+        ''')
+    else:
+        read_cursor = conn.cursor()
+        read_cursor.execute("SELECT id, line_user_id, created_at FROM users ORDER BY id")
+        while True:
+            batch = read_cursor.fetchmany(10_000)
+            if not batch:
+                break
+            cursor.executemany(
+                "INSERT INTO users_new (id, bot_id, line_user_id, created_at) VALUES (?, ?, ?, ?)",
+                [(row[0], default_bot_id, row[1], row[2]) for row in batch]
+            )
+
+    # Drop old table and rename new one
+    cursor.execute('DROP TABLE users')
+    cursor.execute('ALTER TABLE users_new RENAME TO users')
+
+    # Build the uniqueness index once, after the bulk copy
+    cursor.execute('CREATE UNIQUE INDEX ux_users_bot_line ON users(bot_id, line_user_id)')
+
 
 def migrate_database():
     """Migrate database to support multiple bots"""
 
     if not Path(DB_PATH).exists():
-        print(f"Database file not found at {DB_PATH}")
-        print("No migration needed - init_db() will create the new schema.")
+        logger.info("Database file not found at %s", DB_PATH)
+        logger.info("No migration needed - init_db() will create the new schema.")
         return
 
-    conn = sqlite3.connect(DB_PATH)
+    # isolation_level=None disables Python's implicit transaction handling so
+    # the explicit BEGIN IMMEDIATE below controls transaction boundaries
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
 
-    print("Starting database migration...")
+    # Use WAL with relaxed fsync so the DDL + copy sequence below doesn't pay
+    # a rollback-journal fsync per statement, and runtime writers won't block
+    # readers afterwards (WAL mode persists on the database file)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA foreign_keys=ON")
+
+    logger.info("Starting database migration...")
 
     try:
+        # Acquire the writer lock up-front and run every DDL statement plus the
+        # users copy in one transaction so the whole migration commits on a
+        # single fsync instead of one per auto-started transaction
+        cursor.execute("BEGIN IMMEDIATE")
+
         # Check if bots table already exists
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='bots'")
         if cursor.fetchone():
-            print("✓ Database already migrated (bots table exists)")
+            logger.info("✓ Database already migrated (bots table exists)")
+            cursor.execute("ROLLBACK")
             conn.close()
             return
 
         # Backup the database
         backup_path = DB_PATH + ".backup"
-        print(f"Creating backup at {backup_path}...")
+        logger.info("Creating backup at %s...", backup_path)
         import shutil
         shutil.copy2(DB_PATH, backup_path)
-        print("✓ Backup created")
+        logger.info("✓ Backup created")
 
         # Create bots table
-        print("Creating bots table...")
+        logger.info("Creating bots table...")
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS bots (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -47,60 +117,58 @@ def migrate_database():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
-        print("✓ Bots table created")
+        logger.info("✓ Bots table created")
 
         # Insert default bot for existing users
-        print("Creating default 'geodine-ai' bot...")
+        logger.info("Creating default 'geodine-ai' bot...")
         cursor.execute("INSERT INTO bots (bot_id, name) VALUES (?, ?)", ("geodine-ai", "GeoDine-AI"))
         default_bot_id = cursor.lastrowid
-        print(f"✓ Default bot created with ID: {default_bot_id}")
+        logger.info("✓ Default bot created with ID: %s", default_bot_id)
 
         # Check if users table needs migration
         cursor.execute("PRAGMA table_info(users)")
         columns = [col[1] for col in cursor.fetchall()]
 
         if 'bot_id' not in columns:
-            print("Migrating users table...")
-
-            # Create new users table
-            cursor.execute('''
-            CREATE TABLE users_new (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bot_id INTEGER NOT NULL,
-                line_user_id TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (bot_id) REFERENCES bots(id),
-                UNIQUE(bot_id, line_user_id)
-            )
-            ''')
-
-            # Copy existing users to new table with default bot_id
-            cursor.execute(f'''
-            INSERT INTO users_new (id, bot_id, line_user_id, created_at)
-            SELECT id, {default_bot_id}, line_user_id, created_at FROM users
-            ''')
-
-            # Drop old table and rename new one
-            cursor.execute('DROP TABLE users')
-            cursor.execute('ALTER TABLE users_new RENAME TO users')
-            print("✓ Users table migrated")
+            logger.info("Migrating users table...")
+
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                # Modern SQLite can add the column in place - a metadata
+                # update instead of an O(N) table rewrite. DDL can't be
+                # parameterized, but default_bot_id is a locally created int.
+                cursor.execute(
+                    f"ALTER TABLE users ADD COLUMN bot_id INTEGER NOT NULL DEFAULT {default_bot_id}"
+                )
+                cursor.execute('CREATE UNIQUE INDEX ux_users_bot_line ON users(bot_id, line_user_id)')
+
+                # The FK to bots(id) can't be added in place; verify the data
+                # is consistent instead
+                cursor.execute("PRAGMA foreign_key_check(users)")
+            else:
+                _rebuild_users_table(conn, cursor, default_bot_id)
+
+            logger.info("✓ Users table migrated")
         else:
-            print("✓ Users table already has bot_id column")
+            logger.info("✓ Users table already has bot_id column")
 
         # Commit changes
-        conn.commit()
-        print("\n✅ Migration completed successfully!")
-        print(f"Backup saved at: {backup_path}")
+        cursor.execute("COMMIT")
+        logger.info("\n✅ Migration completed successfully!")
+        logger.info("Backup saved at: %s", backup_path)
 
     except Exception as e:
-        print(f"\n❌ Migration failed: {e}")
-        conn.rollback()
+        logger.error("\n❌ Migration failed: %s", e)
+        cursor.execute("ROLLBACK")
         raise
     finally:
         conn.close()
 
 
 if __name__ == "__main__":
+    # Route migration progress to stdout when run as a script; library-style
+    # callers control logging themselves
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("=" * 50)
     print("Database Migration for Multi-Bot Support")
     print("=" * 50)
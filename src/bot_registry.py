@@ -1,9 +1,54 @@
 """
 Bot registry for managing multiple LINE bot instances
 """
-from typing import Dict, Optional
+import functools
+import logging
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+import requests
+from requests.adapters import HTTPAdapter
 from linebot import LineBotApi, WebhookHandler
-from src.bot_config import BotConfig, config_manager
+from linebot.http_client import RequestsHttpClient, RequestsHttpResponse
+from src.bot_config import BotConfig, get_config_manager
+
+logger = logging.getLogger(__name__)
+
+# One connection pool for every bot: the SDK's default client calls the
+# bare requests functions, paying a TCP+TLS handshake per API call. All
+# bots talk to the same api.line.me host, so a single shared Session
+# keeps warm connections across bots and events.
+_line_session = requests.Session()
+_line_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+class PooledRequestsHttpClient(RequestsHttpClient):
+    """RequestsHttpClient that sends through the shared pooled Session"""
+
+    def get(self, url, headers=None, params=None, stream=False, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        response = _line_session.get(
+            url, headers=headers, params=params, stream=stream, timeout=timeout
+        )
+        return RequestsHttpResponse(response)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        response = _line_session.post(url, headers=headers, data=data, timeout=timeout)
+        return RequestsHttpResponse(response)
+
+    def delete(self, url, headers=None, data=None, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        response = _line_session.delete(url, headers=headers, data=data, timeout=timeout)
+        return RequestsHttpResponse(response)
+
+    def put(self, url, headers=None, data=None, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        response = _line_session.put(url, headers=headers, data=data, timeout=timeout)
+        return RequestsHttpResponse(response)
 
 
 class BotInstance:
@@ -13,8 +58,19 @@ class BotInstance:
 
     def __init__(self, config: BotConfig):
         self.config = config
-        self.api = LineBotApi(config.channel_access_token)
-        self.handler = WebhookHandler(config.channel_secret)
+
+    @functools.cached_property
+    def api(self) -> LineBotApi:
+        """LINE API client, constructed on first use (shares the pooled session)"""
+        return LineBotApi(
+            self.config.channel_access_token,
+            http_client=PooledRequestsHttpClient
+        )
+
+    @functools.cached_property
+    def handler(self) -> WebhookHandler:
+        """Webhook handler, constructed on first use"""
+        return WebhookHandler(self.config.channel_secret)
 
     @property
     def bot_id(self) -> str:
@@ -56,52 +112,82 @@ class BotRegistry:
             return
 
         self.bots: Dict[str, BotInstance] = {}
+        # Secondary index for O(1) webhook-path lookups on the request path
+        self._bots_by_path: Dict[str, BotInstance] = {}
+        # Read-only view handed out by get_all_bots (tracks self.bots live)
+        self._bots_view = MappingProxyType(self.bots)
+        # Memoized bot_id lookup for the steady-state webhook path; cleared
+        # whenever the bot set changes
+        self._cached_get_bot = functools.lru_cache(maxsize=64)(self.bots.get)
         self._initialized = True
         self._load_bots()
 
     def _load_bots(self):
         """Load all enabled bots from configuration"""
-        for bot_config in config_manager.get_enabled_bots():
+        for bot_config in get_config_manager().get_enabled_bots():
             try:
                 bot_instance = BotInstance(bot_config)
                 self.bots[bot_config.bot_id] = bot_instance
-                print(f"Registered bot: {bot_config.bot_id} ({bot_config.name})")
+                self._bots_by_path[bot_instance.webhook_path] = bot_instance
+                logger.info("Registered bot: %s (%s)", bot_config.bot_id, bot_config.name)
             except Exception as e:
-                print(f"Error loading bot {bot_config.bot_id}: {e}")
+                logger.error("Error loading bot %s: %s", bot_config.bot_id, e)
 
     def get_bot(self, bot_id: str) -> Optional[BotInstance]:
         """Get a bot instance by bot_id"""
-        return self.bots.get(bot_id)
+        return self._cached_get_bot(bot_id)
 
     def get_bot_by_webhook_path(self, path: str) -> Optional[BotInstance]:
         """Find a bot by its webhook path"""
-        for bot in self.bots.values():
-            if bot.webhook_path == path:
-                return bot
-        return None
+        return self._bots_by_path.get(path)
 
-    def get_all_bots(self) -> Dict[str, BotInstance]:
-        """Get all registered bot instances"""
-        return self.bots.copy()
+    def get_all_bots(self) -> Mapping[str, BotInstance]:
+        """
+        Get all registered bot instances as a read-only view.
+        Callers needing a mutable copy can wrap the result in dict().
+        """
+        return self._bots_view
 
     def register_bot(self, config: BotConfig) -> BotInstance:
         """Register a new bot instance"""
         bot_instance = BotInstance(config)
         self.bots[config.bot_id] = bot_instance
+        self._bots_by_path[bot_instance.webhook_path] = bot_instance
+        self._cached_get_bot.cache_clear()
         return bot_instance
 
     def unregister_bot(self, bot_id: str) -> bool:
         """Unregister a bot instance"""
         if bot_id in self.bots:
-            del self.bots[bot_id]
+            bot_instance = self.bots.pop(bot_id)
+            self._bots_by_path.pop(bot_instance.webhook_path, None)
+            self._cached_get_bot.cache_clear()
             return True
         return False
 
     def reload(self):
         """Reload all bots from configuration"""
         self.bots.clear()
+        self._bots_by_path.clear()
+        self._cached_get_bot.cache_clear()
         self._load_bots()
 
 
-# Global bot registry instance
-bot_registry = BotRegistry()
+# Global bot registry instance, created lazily so importing this module
+# doesn't construct LINE API clients (or trigger config loading) by itself
+_bot_registry: Optional[BotRegistry] = None
+
+
+def get_bot_registry() -> BotRegistry:
+    """Get the global BotRegistry, creating it on first use"""
+    global _bot_registry
+    if _bot_registry is None:
+        _bot_registry = BotRegistry()
+    return _bot_registry
+
+
+def __getattr__(name: str):
+    """Keep `from src.bot_registry import bot_registry` working (PEP 562)"""
+    if name == "bot_registry":
+        return get_bot_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,7 @@ import os
 from dotenv import load_dotenv
 
 from src.daily_broadcast_service import get_broadcast_service
+from src.database import get_bot_subscriber_stats
 from src.security import validate_api_key
 
 # Load environment variables
@@ -60,12 +61,10 @@ async def broadcast_daily_weather(
     - delay_between_users: Seconds to wait between sending to each user (default: 0.5)
 
     **Returns**:
-    - status: "success" or "partial_success" or "failed"
+    - status: "accepted" once the broadcast has been scheduled
     - message: Human-readable status message
-    - total_subscribers: Total number of subscribers found
-    - successful: Number of successful sends
-    - failed: Number of failed sends
-    - errors: List of error messages (if any)
+    - total_subscribers / successful / failed: 0 at scheduling time;
+      check the server logs for per-run results
 
     **Example cURL**:
     ```bash
@@ -85,35 +84,23 @@ async def broadcast_daily_weather(
         raise HTTPException(status_code=401, detail="Invalid or missing API key")
 
     try:
-        # Get broadcast service
+        # Get broadcast service (validates the bot before scheduling)
         broadcast_service = get_broadcast_service(request.bot_id)
 
-        # Execute broadcast (synchronously to ensure it completes)
-        result = broadcast_service.broadcast_daily_weather(
-            delay_between_users=request.delay_between_users
-        )
-
-        # Determine status
-        if result['failed'] == 0:
-            status = "success"
-            message = f"Successfully broadcast to all {result['successful']} subscribers"
-        elif result['successful'] > 0:
-            status = "partial_success"
-            message = (
-                f"Broadcast completed with some errors. "
-                f"Successful: {result['successful']}, Failed: {result['failed']}"
-            )
-        else:
-            status = "failed"
-            message = f"Broadcast failed for all {result['failed']} subscribers"
+        # Run the broadcast after the response is sent. A large subscriber
+        # list would otherwise hold this request's socket and worker slot
+        # for the whole send loop (minutes for hundreds of users). The
+        # concurrent variant caps in-flight sends with a semaphore, so
+        # delay_between_users is kept only for API compatibility.
+        background_tasks.add_task(broadcast_service.broadcast_daily_weather_async)
 
         return BroadcastResponse(
-            status=status,
-            message=message,
-            total_subscribers=result['total_subscribers'],
-            successful=result['successful'],
-            failed=result['failed'],
-            errors=result['errors'] if result['errors'] else None
+            status="accepted",
+            message=f"Broadcast scheduled for bot '{request.bot_id}'",
+            total_subscribers=0,
+            successful=0,
+            failed=0,
+            errors=None
         )
 
     except ValueError as e:
@@ -218,16 +205,15 @@ async def get_broadcast_status(
         # Get broadcast service to validate bot exists
         broadcast_service = get_broadcast_service(bot_id)
 
-        # Get subscriber count
-        from src.database import get_all_bot_subscribers
-        subscribers = get_all_bot_subscribers(bot_id)
+        # Count subscribers in SQL instead of materializing the full list
+        subscriber_count, subscribers_with_location = get_bot_subscriber_stats(bot_id)
 
         return {
             "bot_id": bot_id,
             "bot_name": broadcast_service.bot_instance.name,
             "bot_type": broadcast_service.bot_instance.bot_type,
-            "subscriber_count": len(subscribers),
-            "subscribers_with_location": sum(1 for s in subscribers if s.get('latitude')),
+            "subscriber_count": subscriber_count,
+            "subscribers_with_location": subscribers_with_location,
             "has_custom_prompt": bool(broadcast_service.bot_instance.config.image_prompt_template),
             "status": "ready"
         }
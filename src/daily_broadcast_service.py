@@ -4,21 +4,60 @@ Daily Weather Broadcast Service
 This service handles the daily broadcast of weather-based outfit recommendations
 to all Weather OOTD bot subscribers. Designed to be called via cron job.
 """
+import asyncio
+import hashlib
+import logging
 import os
+import queue
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Dict, Any, Optional, Tuple
 from linebot.models import TextSendMessage, ImageSendMessage
 from linebot.exceptions import LineBotApiError
 
-from src.database import get_all_bot_subscribers
-from src.bot_registry import bot_registry, BotInstance
+from src.database import SubscriberRow, get_bot_subscriber_stats, iter_bot_subscribers
+from src.bot_registry import get_bot_registry, BotInstance
 from src.weather_service import WeatherService, get_location_name
 from src.image_generation_service import get_image_service
 
+# Broadcast workers log heavily while running concurrently; a queue-backed
+# handler keeps the hot path to an enqueue and moves formatting + stdout
+# writes onto the listener's thread, so logging never serializes the pool
+logger = logging.getLogger("broadcast")
+if not logger.handlers:
+    _log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.setLevel(logging.INFO)
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter("[Broadcast] %(message)s"))
+    _log_listener = QueueListener(_log_queue, _stream_handler)
+    _log_listener.start()
+
+# Bump to invalidate cached outfit images when prompt semantics change
+IMAGE_CACHE_VERSION = "v1"
+
+# Messages identical for every recipient, built once instead of per send
+_FOLLOW_UP_MESSAGE = TextSendMessage(text=(
+    "✨ Here's your daily outfit recommendation!\n\n"
+    "Have a wonderful day! 💕"
+))
+_IMAGE_FAILED_MESSAGE = TextSendMessage(text=(
+    "⚠️ Unable to generate outfit image at the moment.\n"
+    "Please use the 'outfit' command later to try again!"
+))
+
 
 class DailyBroadcastService:
     """Service for broadcasting daily weather and outfit recommendations"""
 
+    _INTRO_TEMPLATE = (
+        "☀️ Good morning! Here's your daily weather & outfit recommendation\n\n"
+        "📍 {location_name}\n\n"
+        "{weather_summary}"
+    )
+
     def __init__(self, bot_id: str = "weather-ootd"):
         """
         Initialize broadcast service for a specific bot
@@ -27,7 +66,7 @@ class DailyBroadcastService:
             bot_id: The bot ID to broadcast from (default: "weather-ootd")
         """
         self.bot_id = bot_id
-        self.bot_instance = bot_registry.get_bot(bot_id)
+        self.bot_instance = get_bot_registry().get_bot(bot_id)
 
         if not self.bot_instance:
             raise ValueError(f"Bot '{bot_id}' not found in registry. Ensure bot is enabled in configuration.")
@@ -37,13 +76,69 @@ class DailyBroadcastService:
 
         self.image_service = get_image_service()
 
+        # Resolved once per service instead of once per subscriber when
+        # converting relative image paths to full URLs
+        self.server_url = os.getenv("SERVER_URL", "https://your-server-url.com")
+
+        # Per-run weather cache keyed by ~11km grid cell; subscribers in the
+        # same city share one Open-Meteo call instead of N identical fetches.
+        # Values are Futures so concurrent pool workers hitting the same cell
+        # coalesce onto a single in-flight request.
+        self._weather_cache: Dict[Tuple[float, float], Future] = {}
+        self._weather_cache_lock = threading.Lock()
+
+        # Per-run outfit image cache keyed by weather bucket + prompt hash.
+        # Image generation is the most expensive step per subscriber (seconds
+        # of latency and real API cost), and subscribers with similar weather
+        # get interchangeable outfits, so N generations collapse to one per
+        # distinct weather bucket. Same Future coalescing as the weather cache.
+        self._image_cache: Dict[str, Future] = {}
+        self._image_cache_lock = threading.Lock()
+
+    def _get_weather_cached(self, latitude: float, longitude: float) -> Optional[dict]:
+        """
+        Fetch today's weather for a location, deduplicated per broadcast run.
+
+        Coordinates are rounded to a 0.1° grid (~11 km) so nearby subscribers
+        reuse the same forecast. The first caller for a cell performs the
+        fetch; concurrent callers block on its Future instead of re-fetching.
+        """
+        key = (round(latitude, 1), round(longitude, 1))
+
+        with self._weather_cache_lock:
+            future = self._weather_cache.get(key)
+            if future is None:
+                future = Future()
+                self._weather_cache[key] = future
+                is_owner = True
+            else:
+                is_owner = False
+
+        if is_owner:
+            try:
+                future.set_result(WeatherService.get_today_weather(latitude, longitude))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
     def broadcast_daily_weather(self, delay_between_users: float = 0.5) -> Dict[str, Any]:
         """
         Broadcast daily weather and outfit recommendation to all subscribers
 
+        Runs as a pipeline: a thread pool (size from the BROADCAST_WORKERS
+        env var, default 16) resolves weather and intro text per subscriber,
+        then subscribers are grouped by identical messages and each group
+        generates its outfit image (deduplicated by weather bucket) and
+        multicasts in slices of up to 500 user ids — so image generation for
+        one group overlaps with LINE sends for another. Slices that fail
+        fall back to per-user push_message.
+
         Args:
-            delay_between_users: Delay in seconds between sending to each user (default: 0.5)
-                                This prevents hitting LINE API rate limits
+            delay_between_users: Delay in seconds between multicast calls
+                                (default: 0.5). Rate limiting is far less of
+                                a concern with multicast; kept for API
+                                compatibility.
 
         Returns:
             Dict with broadcast results: {
@@ -53,13 +148,17 @@ class DailyBroadcastService:
                 'errors': List[str]
             }
         """
-        print(f"[Broadcast] Starting daily weather broadcast for bot: {self.bot_id}")
+        logger.info("Starting daily weather broadcast for bot: %s", self.bot_id)
+
+        # Fresh forecasts and images for each run
+        self._weather_cache.clear()
+        self._image_cache.clear()
 
-        # Get all subscribers
-        subscribers = get_all_bot_subscribers(self.bot_id)
-        total_subscribers = len(subscribers)
+        # Cheap COUNT for reporting; rows themselves stream through the
+        # generator below instead of being materialized up front
+        total_subscribers, _ = get_bot_subscriber_stats(self.bot_id)
 
-        print(f"[Broadcast] Found {total_subscribers} subscribers")
+        logger.info("Found %d subscribers", total_subscribers)
 
         if total_subscribers == 0:
             return {
@@ -74,113 +173,198 @@ class DailyBroadcastService:
         failed = 0
         errors = []
 
-        # Process each subscriber
-        for idx, subscriber in enumerate(subscribers, 1):
-            line_user_id = subscriber['line_user_id']
-            latitude = subscriber.get('latitude')
-            longitude = subscriber.get('longitude')
+        # Phase 1: resolve weather and images concurrently. Only the deduped
+        # Open-Meteo and image-generation calls happen here, so no pacing is
+        # needed; slow steps overlap across workers instead of serializing
+        max_workers = int(os.getenv("BROADCAST_WORKERS", "16"))
 
-            print(f"[Broadcast] Processing subscriber {idx}/{total_subscribers}: {line_user_id}")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            subscribers = list(iter_bot_subscribers(self.bot_id))
 
-            try:
-                # Use subscriber's location or default to Taipei
-                if latitude and longitude:
-                    location_name = subscriber.get('location_name') or get_location_name(latitude, longitude)
-                else:
-                    latitude = WeatherService.DEFAULT_LATITUDE
-                    longitude = WeatherService.DEFAULT_LONGITUDE
-                    location_name = "Taipei, Taiwan (default)"
-
-                # Fetch weather data
-                weather_data = WeatherService.get_today_weather(latitude, longitude)
-
-                if not weather_data:
-                    error_msg = f"Failed to fetch weather for user {line_user_id}"
-                    print(f"[Broadcast] ❌ {error_msg}")
-                    errors.append(error_msg)
-                    failed += 1
-                    continue
-
-                # Send weather summary first
-                weather_summary = WeatherService.format_weather_summary(weather_data)
-                intro_message = (
-                    f"☀️ Good morning! Here's your daily weather & outfit recommendation\n\n"
-                    f"📍 {location_name}\n\n"
-                    f"{weather_summary}\n\n"
-                    f"🎨 Generating your outfit image..."
-                )
+            # Warm the weather cache for every unique grid cell up front so
+            # the prepare phase is pure cache hits on the weather side and
+            # image generation can start without waiting on forecasts
+            self._prefetch_weather(executor, subscribers)
 
-                self.bot_instance.api.push_message(
-                    line_user_id,
-                    TextSendMessage(text=intro_message)
-                )
+            prepared = list(executor.map(self._prepare_subscriber, subscribers))
 
-                # Generate outfit image (this may take time)
-                print(f"[Broadcast] Generating image for user {line_user_id}...")
-                image_url_or_path = self._generate_outfit_image(weather_data)
-
-                if image_url_or_path:
-                    # Convert relative path to full URL if needed
-                    if image_url_or_path.startswith("/generated_images/"):
-                        server_url = os.getenv("SERVER_URL", "https://your-server-url.com")
-                        full_url = f"{server_url}{image_url_or_path}"
-                    else:
-                        full_url = image_url_or_path
-
-                    # Send the generated image
-                    self.bot_instance.api.push_message(
-                        line_user_id,
-                        ImageSendMessage(
-                            original_content_url=full_url,
-                            preview_image_url=full_url
-                        )
-                    )
+        # Phase 2: group, generate images and multicast
+        successful, failed, errors = self._send_prepared(prepared, delay_between_users)
 
-                    # Send follow-up message
-                    follow_up = (
-                        "✨ Here's your daily outfit recommendation!\n\n"
-                        "Have a wonderful day! 💕"
-                    )
-                    self.bot_instance.api.push_message(
-                        line_user_id,
-                        TextSendMessage(text=follow_up)
-                    )
+        # Summary
+        result = {
+            'total_subscribers': total_subscribers,
+            'successful': successful,
+            'failed': failed,
+            'errors': errors
+        }
 
-                    print(f"[Broadcast] ✅ Successfully sent to user {line_user_id}")
-                    successful += 1
-                else:
-                    # Image generation failed, but still count as partial success
-                    error_message = (
-                        "⚠️ Unable to generate outfit image at the moment.\n"
-                        "Please use the 'outfit' command later to try again!"
-                    )
-                    self.bot_instance.api.push_message(
-                        line_user_id,
-                        TextSendMessage(text=error_message)
-                    )
+        logger.info("Completed! Success: %d, Failed: %d", successful, failed)
+        return result
 
-                    error_msg = f"Image generation failed for user {line_user_id}"
-                    print(f"[Broadcast] ⚠️ {error_msg}")
-                    errors.append(error_msg)
-                    successful += 1  # Still count as success since weather was sent
+    def _prefetch_weather(self, executor: ThreadPoolExecutor, subscribers: List[SubscriberRow]):
+        """
+        Fire weather fetches for every unique grid cell concurrently,
+        populating the per-run cache before any subscriber is prepared.
+        """
+        cells = set()
+        for subscriber in subscribers:
+            latitude = subscriber.latitude
+            longitude = subscriber.longitude
+            if not (latitude and longitude):
+                latitude = WeatherService.DEFAULT_LATITUDE
+                longitude = WeatherService.DEFAULT_LONGITUDE
+            cells.add((round(latitude, 1), round(longitude, 1)))
+
+        def fetch(cell: Tuple[float, float]):
+            try:
+                self._get_weather_cached(*cell)
+            except Exception:
+                pass  # surfaces per subscriber in _prepare_subscriber
 
-            except LineBotApiError as e:
-                error_msg = f"LINE API error for user {line_user_id}: {str(e)}"
-                print(f"[Broadcast] ❌ {error_msg}")
-                errors.append(error_msg)
-                failed += 1
+        list(executor.map(fetch, cells))
 
-            except Exception as e:
-                error_msg = f"Unexpected error for user {line_user_id}: {str(e)}"
-                print(f"[Broadcast] ❌ {error_msg}")
-                errors.append(error_msg)
+    def _send_prepared(self, prepared: List[Dict[str, Any]], delay_between_users: float) -> Tuple[int, int, List[str]]:
+        """
+        Group prepared subscribers by identical messages and run each
+        group's image generation + multicast as one pool task, so slow
+        generations for one group overlap with sends for another.
+
+        Returns:
+            (successful, failed, errors) counters for the run
+        """
+        successful = 0
+        failed = 0
+        errors = []
+
+        custom_prompt = self.bot_instance.config.image_prompt_template
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for item in prepared:
+            if 'error' in item:
                 failed += 1
+                errors.append(item['error'])
+                continue
+            key = (item['intro'], self._image_cache_key(item['weather_data'], custom_prompt))
+            group = groups.setdefault(key, {
+                'intro': item['intro'],
+                'weather_data': item['weather_data'],
+                'user_ids': []
+            })
+            group['user_ids'].append(item['line_user_id'])
+
+        logger.info("Sending %d message group(s) to %d subscribers", len(groups), len(prepared) - failed)
+
+        max_workers = int(os.getenv("BROADCAST_WORKERS", "16"))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for group_successful, group_failed, group_errors in executor.map(
+                lambda group: self._send_group(group, delay_between_users),
+                groups.values()
+            ):
+                successful += group_successful
+                failed += group_failed
+                errors.extend(group_errors)
+
+        return successful, failed, errors
+
+    def _send_group(self, group: Dict[str, Any], delay_between_users: float) -> Tuple[int, int, List[str]]:
+        """
+        Generate the outfit image for one message group and multicast it to
+        the group's members, chunked to LINE's 500-recipient limit.
+        """
+        successful = 0
+        failed = 0
+        errors = []
+        user_ids = group['user_ids']
+
+        # Generate outfit image (cached per weather bucket, so groups that
+        # share a bucket reuse one generation)
+        image_url_or_path = self._generate_outfit_image(group['weather_data'])
+
+        image_url = None
+        if image_url_or_path:
+            # Convert relative path to full URL if needed
+            if image_url_or_path.startswith("/generated_images/"):
+                image_url = f"{self.server_url}{image_url_or_path}"
+            else:
+                image_url = image_url_or_path
+
+        messages = self._build_broadcast_messages(group['intro'], image_url)
 
-            # Delay between users to avoid rate limiting
-            if idx < total_subscribers:
+        for offset in range(0, len(user_ids), 500):
+            chunk = user_ids[offset:offset + 500]
+            try:
+                self.bot_instance.api.multicast(chunk, messages)
+                successful += len(chunk)
+            except LineBotApiError as e:
+                # One bad user id fails the whole slice; retry members
+                # individually so the rest still get their broadcast
+                logger.warning("⚠️ Multicast failed (%s), falling back to per-user push", e)
+                for line_user_id in chunk:
+                    try:
+                        self.bot_instance.api.push_message(line_user_id, messages)
+                        successful += 1
+                    except LineBotApiError as push_error:
+                        failed += 1
+                        errors.append(f"LINE API error for user {line_user_id}: {str(push_error)}")
+
+            if delay_between_users > 0:
                 time.sleep(delay_between_users)
 
-        # Summary
+        if image_url is None:
+            # Weather summary went out but the image didn't: partial
+            # success, same as before
+            errors.extend(f"Image generation failed for user {line_user_id}" for line_user_id in user_ids)
+
+        return successful, failed, errors
+
+    async def broadcast_daily_weather_async(self, max_concurrency: int = 32) -> Dict[str, Any]:
+        """
+        Broadcast daily weather to all subscribers from the event loop.
+
+        Per-subscriber preparation (weather fetch, image generation) is
+        I/O-bound but built on blocking clients, so each call runs in a
+        worker thread via asyncio.to_thread while the event loop multiplexes
+        the in-flight requests, capped by a semaphore. Delivery then goes
+        through the same grouping + multicast phase as the synchronous
+        broadcast.
+
+        Args:
+            max_concurrency: Maximum number of subscribers prepared at once
+
+        Returns:
+            Same result dict as broadcast_daily_weather()
+        """
+        logger.info("Starting concurrent daily weather broadcast for bot: %s", self.bot_id)
+
+        # Fresh forecasts and images for each run
+        self._weather_cache.clear()
+        self._image_cache.clear()
+
+        total_subscribers, _ = get_bot_subscriber_stats(self.bot_id)
+
+        logger.info("Found %d subscribers", total_subscribers)
+
+        if total_subscribers == 0:
+            return {
+                'total_subscribers': 0,
+                'successful': 0,
+                'failed': 0,
+                'errors': []
+            }
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def prepare_one(subscriber: SubscriberRow) -> Dict[str, Any]:
+            async with semaphore:
+                # The weather and image services are blocking, so each
+                # subscriber's preparation runs in a worker thread
+                return await asyncio.to_thread(self._prepare_subscriber, subscriber)
+
+        prepared = await asyncio.gather(*(prepare_one(s) for s in iter_bot_subscribers(self.bot_id)))
+
+        # Multicast removes the need for pacing between sends here
+        successful, failed, errors = await asyncio.to_thread(self._send_prepared, list(prepared), 0.0)
+
         result = {
             'total_subscribers': total_subscribers,
             'successful': successful,
@@ -188,13 +372,94 @@ class DailyBroadcastService:
             'errors': errors
         }
 
-        print(f"[Broadcast] Completed! Success: {successful}, Failed: {failed}")
+        logger.info("Completed! Success: %d, Failed: %d", result['successful'], result['failed'])
         return result
 
+    def _prepare_subscriber(self, subscriber: SubscriberRow) -> Dict[str, Any]:
+        """
+        Resolve weather, intro text and outfit image for one subscriber
+        without sending anything.
+
+        Returns:
+            Dict with 'line_user_id' plus either 'intro' and 'weather_data'
+            or an 'error' message when weather could not be fetched. Image
+            generation is deferred to _send_group so it can overlap with
+            message dispatch for other groups.
+        """
+        line_user_id = subscriber.line_user_id
+        latitude = subscriber.latitude
+        longitude = subscriber.longitude
+
+        try:
+            # Use subscriber's location or default to Taipei
+            if latitude and longitude:
+                location_name = subscriber.location_name or get_location_name(latitude, longitude)
+            else:
+                latitude = WeatherService.DEFAULT_LATITUDE
+                longitude = WeatherService.DEFAULT_LONGITUDE
+                location_name = "Taipei, Taiwan (default)"
+
+            # Fetch weather data (shared across subscribers in the same grid cell)
+            weather_data = self._get_weather_cached(latitude, longitude)
+
+            if not weather_data:
+                error_msg = f"Failed to fetch weather for user {line_user_id}"
+                logger.error("❌ %s", error_msg)
+                return {'line_user_id': line_user_id, 'error': error_msg}
+
+            weather_summary = WeatherService.format_weather_summary(weather_data)
+            intro_message = self._INTRO_TEMPLATE.format(
+                location_name=location_name,
+                weather_summary=weather_summary
+            )
+
+            return {'line_user_id': line_user_id, 'intro': intro_message, 'weather_data': weather_data}
+
+        except Exception as e:
+            error_msg = f"Unexpected error for user {line_user_id}: {str(e)}"
+            logger.error("❌ %s", error_msg)
+            return {'line_user_id': line_user_id, 'error': error_msg}
+
+    @staticmethod
+    def _build_broadcast_messages(intro: str, image_url: Optional[str]) -> List[Any]:
+        """Build the message list for one broadcast group (shared by multicast and push)"""
+        messages = [TextSendMessage(text=intro)]
+
+        if image_url:
+            messages.append(ImageSendMessage(
+                original_content_url=image_url,
+                preview_image_url=image_url
+            ))
+            messages.append(_FOLLOW_UP_MESSAGE)
+        else:
+            # Image generation failed, but still send the weather summary
+            messages.append(_IMAGE_FAILED_MESSAGE)
+
+        return messages
+
+    @staticmethod
+    def _image_cache_key(weather_data: dict, custom_prompt: Optional[str]) -> str:
+        """
+        Build a cache key bucketing weather into outfit-equivalent groups:
+        average temperature in 3°C bands, weather code, and a rain flag,
+        plus a hash of the prompt template so template edits miss the cache.
+        """
+        avg_temp = (weather_data.get('temp_max', 20) + weather_data.get('temp_min', 15)) / 2
+        temp_band = round(avg_temp / 3) * 3
+        weather_code = weather_data.get('weather_code', 0)
+        has_precipitation = int(weather_data.get('precipitation', 0) > 0)
+        prompt_hash = hashlib.sha1((custom_prompt or '').encode()).hexdigest()[:12]
+
+        return f"{IMAGE_CACHE_VERSION}|{temp_band}|{weather_code}|{has_precipitation}|{prompt_hash}"
+
     def _generate_outfit_image(self, weather_data: dict) -> Optional[str]:
         """
         Generate outfit image using weather data and bot's custom prompt
 
+        Results are cached per broadcast run by weather bucket, so subscribers
+        with equivalent weather share one generated image instead of each
+        paying a multi-second gpt-image-1 call.
+
         Args:
             weather_data: Weather data dictionary from WeatherService
 
@@ -205,18 +470,33 @@ class DailyBroadcastService:
             # Get custom prompt from bot configuration
             custom_prompt = self.bot_instance.config.image_prompt_template
 
-            # Generate image using gpt-image-1
-            image_url = self.image_service.generate_outfit_image(
-                weather_data=weather_data,
-                custom_prompt=custom_prompt,
-                model="gpt-image-1",
-                quality="auto"
-            )
+            cache_key = self._image_cache_key(weather_data, custom_prompt)
 
-            return image_url
+            with self._image_cache_lock:
+                future = self._image_cache.get(cache_key)
+                if future is None:
+                    future = Future()
+                    self._image_cache[cache_key] = future
+                    is_owner = True
+                else:
+                    is_owner = False
+
+            if is_owner:
+                try:
+                    # Generate image using gpt-image-1
+                    future.set_result(self.image_service.generate_outfit_image(
+                        weather_data=weather_data,
+                        custom_prompt=custom_prompt,
+                        model="gpt-image-1",
+                        quality="auto"
+                    ))
+                except Exception as e:
+                    future.set_exception(e)
+
+            return future.result()
 
         except Exception as e:
-            print(f"[Broadcast] Error generating outfit image: {e}")
+            logger.error("Error generating outfit image: %s", e)
             return None
 
     def send_test_broadcast(self, test_user_id: str) -> bool:
@@ -229,7 +509,7 @@ class DailyBroadcastService:
         Returns:
             True if successful, False otherwise
         """
-        print(f"[Broadcast] Sending test broadcast to user: {test_user_id}")
+        logger.info("Sending test broadcast to user: %s", test_user_id)
 
         try:
             # Use default Taipei location for test
@@ -237,11 +517,11 @@ class DailyBroadcastService:
             longitude = WeatherService.DEFAULT_LONGITUDE
             location_name = "Taipei, Taiwan (test)"
 
-            # Fetch weather data
-            weather_data = WeatherService.get_today_weather(latitude, longitude)
+            # Fetch weather data (reuses the per-run cache when warm)
+            weather_data = self._get_weather_cached(latitude, longitude)
 
             if not weather_data:
-                print("[Broadcast] ❌ Failed to fetch weather data")
+                logger.error("❌ Failed to fetch weather data")
                 return False
 
             # Send weather summary
@@ -260,7 +540,7 @@ class DailyBroadcastService:
             )
 
             # Generate and send image
-            print("[Broadcast] Generating test image...")
+            logger.info("Generating test image...")
             image_url = self._generate_outfit_image(weather_data)
 
             if image_url:
@@ -277,18 +557,18 @@ class DailyBroadcastService:
                     TextSendMessage(text="✅ Test broadcast completed successfully!")
                 )
 
-                print("[Broadcast] ✅ Test broadcast successful")
+                logger.info("✅ Test broadcast successful")
                 return True
             else:
                 self.bot_instance.api.push_message(
                     test_user_id,
                     TextSendMessage(text="❌ Test failed: Unable to generate image")
                 )
-                print("[Broadcast] ❌ Test failed: Image generation failed")
+                logger.error("❌ Test failed: Image generation failed")
                 return False
 
         except Exception as e:
-            print(f"[Broadcast] ❌ Test failed with error: {e}")
+            logger.error("❌ Test failed with error: %s", e)
             return False
 
 
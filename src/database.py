@@ -1,122 +1,304 @@
+"""
+SQLite persistence for bots, users, locations and preferences.
+
+Connections are pooled per thread rather than opened per call: each thread
+holds one long-lived read-write connection and one read-only connection,
+configured once with WAL journaling so readers and the writer don't block
+each other and SQLite's page cache stays warm across queries.
+"""
+import atexit
+import functools
+import logging
 import os
 import sqlite3
+import threading
+import time
+from collections import namedtuple
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 
+logger = logging.getLogger(__name__)
+
 # Database path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "geodine.db")
 
+
+def apply_performance_pragmas(conn: sqlite3.Connection):
+    """
+    Apply performance-oriented PRAGMAs to a connection.
+
+    WAL mode lets writers avoid blocking readers and makes commit fsyncs
+    cheaper with synchronous=NORMAL. WAL is persistent on the database file,
+    but re-asserting on each connection is cheap, so we do it every time.
+    """
+    cursor = conn.cursor()
+
+    # WAL requires a real database file (not supported for :memory:)
+    if DB_PATH != ":memory:":
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA foreign_keys=ON")
+
+
+# Per-thread connections: opening a fresh connection per call re-parses the
+# schema and re-runs PRAGMA setup, which dominates the cost of the small
+# queries on hot paths like webhook handlers. Each thread keeps one
+# read-write and one read-only connection for its lifetime; WAL mode keeps
+# readers from blocking the writer. check_same_thread=False only so the
+# atexit hook can close them from the main thread.
+_local = threading.local()
+_open_connections: List[sqlite3.Connection] = []
+_open_connections_lock = threading.Lock()
+
+
+def _open_connection() -> sqlite3.Connection:
+    # cached_statements sizes sqlite3's per-connection prepared-statement
+    # cache; with long-lived pooled connections the hot queries stay parsed
+    # and planned for the life of the thread
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    apply_performance_pragmas(conn)
+    with _open_connections_lock:
+        _open_connections.append(conn)
+    return conn
+
+
+@atexit.register
+def _close_pooled_connections():
+    with _open_connections_lock:
+        for conn in _open_connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _open_connections.clear()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Get the long-lived read-write connection for the current thread"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _open_connection()
+        _local.conn = conn
+    return conn
+
+
+def _get_reader_connection() -> sqlite3.Connection:
+    """
+    Get a long-lived read-only connection for the current thread.
+
+    In WAL mode readers never block the writer (or each other), so hot read
+    paths can reuse one connection per thread instead of paying connect +
+    PRAGMA setup on every call.
+    """
+    conn = getattr(_local, "reader_conn", None)
+    if conn is None:
+        conn = _open_connection()
+        conn.execute("PRAGMA query_only=1")
+        conn.row_factory = sqlite3.Row
+        _local.reader_conn = conn
+    return conn
+
+
+# Full schema as one script: bots, users (bot-scoped), single-row locations,
+# preferences, plus covering indexes for the hot read paths. The
+# idx_users_bot_created index serves get_all_bot_subscribers' ORDER BY
+# created_at without a sort step, and idx_user_locations_cover lets both
+# its LEFT JOIN and get_user_location resolve entirely from the index.
+# ANALYZE refreshes planner statistics so the indexes actually get picked.
+_SCHEMA_SQL = '''
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS bots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_id TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_id INTEGER NOT NULL,
+    line_user_id TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (bot_id) REFERENCES bots(id),
+    UNIQUE(bot_id, line_user_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    address TEXT,
+    location_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+CREATE TABLE IF NOT EXISTS user_preferences (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    preference_key TEXT NOT NULL,
+    preference_value TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    UNIQUE(user_id, preference_key)
+);
+
+CREATE TABLE IF NOT EXISTS broadcast_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_id TEXT NOT NULL,
+    line_user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_bot_created
+ON users(bot_id, created_at DESC);
+
+DROP INDEX IF EXISTS idx_user_locations_user;
+CREATE INDEX IF NOT EXISTS idx_user_locations_cover
+ON user_locations(user_id, latitude, longitude, address, location_name, updated_at);
+
+ANALYZE;
+
+COMMIT;
+'''
+
+# Shared SQL kept as one constant so every call site presents the identical
+# string to the connection's prepared-statement cache
+_SQL_SELECT_BOT_ID = "SELECT id FROM bots WHERE bot_id = ?"
+
+# Cache-aside for the read-mostly lookups hit on virtually every inbound
+# message: entries live for a short TTL and the save paths invalidate their
+# key, so repeat reads are a dict hit instead of a JOIN round-trip
+_READ_CACHE_TTL = 60.0
+_READ_CACHE_MAX = 10_000
+_location_cache: Dict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+_preference_cache: Dict[Tuple[str, str, str], Tuple[float, Optional[str]]] = {}
+
+
+def _cache_get(cache: dict, key):
+    """Return (hit, value) for a TTL cache entry, dropping expired ones"""
+    entry = cache.get(key)
+    if entry is None:
+        return False, None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        cache.pop(key, None)
+        return False, None
+    return True, value
+
+
+def _cache_set(cache: dict, key, value):
+    # Crude bound: a full cache is dumped wholesale rather than evicted
+    # per-entry; at this size that's rare and keeps the hit path trivial
+    if len(cache) >= _READ_CACHE_MAX:
+        cache.clear()
+    cache[key] = (time.monotonic() + _READ_CACHE_TTL, value)
+
+# Set once init_db has run so repeat callers in the same process skip the DDL
+_db_initialized = False
+
+
 def init_db():
     """Initialize the database and create tables if they don't exist"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    global _db_initialized
+    if _db_initialized:
+        return
+
+    conn = _get_connection()
+
+    # Fail fast if a pre-multi-bot database (users without a bot_id column)
+    # is still on disk; every query and index here assumes the bot-aware
+    # schema and migrate_db.py upgrades old files in place. Checked before
+    # the DDL so the error names the actual problem rather than whichever
+    # CREATE statement happens to trip over the old shape first.
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(users)")]
+    if columns and "bot_id" not in columns:
+        raise RuntimeError(
+            "users table has no bot_id column - run 'python migrate_db.py' to upgrade the database"
+        )
 
-    # Create bots table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS bots (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        bot_id TEXT UNIQUE NOT NULL,
-        name TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-
-    # Create users table - now with bot association
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        bot_id INTEGER NOT NULL,
-        line_user_id TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (bot_id) REFERENCES bots(id),
-        UNIQUE(bot_id, line_user_id)
-    )
-    ''')
-    
-    # Create locations table - updated with unique constraint on user_id
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS user_locations (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL UNIQUE,
-        latitude REAL NOT NULL,
-        longitude REAL NOT NULL,
-        address TEXT,
-        location_name TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users(id)
-    )
-    ''')
-    
-    # Create user preferences table for future use
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS user_preferences (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        preference_key TEXT NOT NULL,
-        preference_value TEXT NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users(id),
-        UNIQUE(user_id, preference_key)
-    )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    # One script in one explicit transaction: a single fsync on cold start
+    # instead of an auto-commit per CREATE statement
+    conn.executescript(_SCHEMA_SQL)
+    _db_initialized = True
 
+# Both get_or_create helpers are memoized for the life of the process: the
+# returned database ids never change once a row exists, the set of bots is
+# tiny, and active users hit these on every webhook event
+@functools.lru_cache(maxsize=64)
 def get_or_create_bot(bot_id: str, bot_name: str = None) -> int:
     """Get bot database ID from bot_id or create if not exists"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_connection()
     cursor = conn.cursor()
 
-    # Check if bot exists
-    cursor.execute("SELECT id FROM bots WHERE bot_id = ?", (bot_id,))
-    bot = cursor.fetchone()
-
-    if bot:
-        db_bot_id = bot[0]
-    else:
-        # Create new bot
-        name = bot_name or bot_id
-        cursor.execute("INSERT INTO bots (bot_id, name) VALUES (?, ?)", (bot_id, name))
-        db_bot_id = cursor.lastrowid
+    # Single upsert instead of SELECT-then-INSERT; the no-op DO UPDATE is
+    # what makes RETURNING produce the id for an existing row
+    cursor.execute(
+        """
+        INSERT INTO bots (bot_id, name) VALUES (?, ?)
+        ON CONFLICT(bot_id) DO UPDATE SET bot_id = excluded.bot_id
+        RETURNING id
+        """,
+        (bot_id, bot_name or bot_id)
+    )
+    db_bot_id = cursor.fetchone()[0]
 
     conn.commit()
-    conn.close()
 
     return db_bot_id
 
 
+@functools.lru_cache(maxsize=8192)
 def get_or_create_user(line_user_id: str, bot_id: str = "geodine-ai") -> int:
     """Get user ID from database or create if not exists"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_connection()
     cursor = conn.cursor()
 
-    # Get or create bot first
-    db_bot_id = get_or_create_bot(bot_id)
-
-    # Check if user exists for this bot
-    cursor.execute(
-        "SELECT id FROM users WHERE line_user_id = ? AND bot_id = ?",
-        (line_user_id, db_bot_id)
-    )
-    user = cursor.fetchone()
-
-    if user:
-        user_id = user[0]
-    else:
-        # Create new user
-        cursor.execute(
-            "INSERT INTO users (line_user_id, bot_id) VALUES (?, ?)",
-            (line_user_id, db_bot_id)
-        )
-        user_id = cursor.lastrowid
+    user_id = _upsert_user(cursor, line_user_id, bot_id)
 
     conn.commit()
-    conn.close()
 
     return user_id
 
+
+def _upsert_user(cursor: sqlite3.Cursor, line_user_id: str, bot_id: str) -> int:
+    """
+    Ensure the bot and user rows exist and return the user's database id,
+    using two upserts inside the caller's transaction.
+
+    The no-op DO UPDATE clauses are deliberate: RETURNING only produces a
+    row when the statement touches one, so a plain DO NOTHING would return
+    no id for existing rows.
+    """
+    cursor.execute(
+        """
+        INSERT INTO bots (bot_id, name) VALUES (?, ?)
+        ON CONFLICT(bot_id) DO UPDATE SET bot_id = excluded.bot_id
+        RETURNING id
+        """,
+        (bot_id, bot_id)
+    )
+    db_bot_id = cursor.fetchone()[0]
+
+    cursor.execute(
+        """
+        INSERT INTO users (line_user_id, bot_id) VALUES (?, ?)
+        ON CONFLICT(bot_id, line_user_id) DO UPDATE SET bot_id = excluded.bot_id
+        RETURNING id
+        """,
+        (line_user_id, db_bot_id)
+    )
+    return cursor.fetchone()[0]
+
 def save_user_location(
     line_user_id: str,
     latitude: float,
@@ -126,57 +308,57 @@ def save_user_location(
     bot_id: str = "geodine-ai"
 ) -> int:
     """Save or update user location in database (keep only one record per user)"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_connection()
     cursor = conn.cursor()
 
-    # Get or create user
-    user_id = get_or_create_user(line_user_id, bot_id)
-    
     try:
-        # Try to update existing record first
+        # One write transaction for the whole bot -> user -> location chain;
+        # upserts with RETURNING replace the old SELECT-then-INSERT round-trips
+        # and the three separate commits
+        cursor.execute("BEGIN IMMEDIATE")
+
+        user_id = _upsert_user(cursor, line_user_id, bot_id)
+
         cursor.execute(
             """
-            UPDATE user_locations 
-            SET latitude = ?, longitude = ?, address = ?, location_name = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ?
-            """, 
-            (latitude, longitude, address, location_name, user_id)
+            INSERT INTO user_locations
+            (user_id, latitude, longitude, address, location_name)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                latitude = excluded.latitude,
+                longitude = excluded.longitude,
+                address = excluded.address,
+                location_name = excluded.location_name,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING id
+            """,
+            (user_id, latitude, longitude, address, location_name)
         )
-        
-        # If no record was updated, insert a new one
-        if cursor.rowcount == 0:
-            cursor.execute(
-                """
-                INSERT INTO user_locations 
-                (user_id, latitude, longitude, address, location_name) 
-                VALUES (?, ?, ?, ?, ?)
-                """, 
-                (user_id, latitude, longitude, address, location_name)
-            )
-        
-        location_id = cursor.lastrowid or cursor.execute("SELECT id FROM user_locations WHERE user_id = ?", (user_id,)).fetchone()[0]
-        
+        location_id = cursor.fetchone()[0]
+
         conn.commit()
+        _location_cache.pop((line_user_id, bot_id), None)
     except Exception as e:
-        print(f"Error saving user location: {str(e)}")
+        logger.error("Error saving user location: %s", e)
         conn.rollback()
         location_id = None
-    finally:
-        conn.close()
-    
+
     return location_id
 
 def get_user_location(line_user_id: str, bot_id: str = "geodine-ai") -> Optional[Dict[str, Any]]:
-    """Get user's current location (single record)"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get user's current location (single record), cached for a short TTL"""
+    cache_key = (line_user_id, bot_id)
+    hit, cached = _cache_get(_location_cache, cache_key)
+    if hit:
+        return dict(cached) if cached else None
+
+    conn = _get_reader_connection()
     cursor = conn.cursor()
 
     # Get bot database ID
-    cursor.execute("SELECT id FROM bots WHERE bot_id = ?", (bot_id,))
+    cursor.execute(_SQL_SELECT_BOT_ID, (bot_id,))
     bot_row = cursor.fetchone()
     if not bot_row:
-        conn.close()
         return None
 
     db_bot_id = bot_row[0]
@@ -193,9 +375,13 @@ def get_user_location(line_user_id: str, bot_id: str = "geodine-ai") -> Optional
     )
     
     location = cursor.fetchone()
-    conn.close()
-    
-    return dict(location) if location else None
+
+    # Misses are cached too (as None) so unknown users don't re-query on
+    # every message; saves invalidate the key
+    result = dict(location) if location else None
+    _cache_set(_location_cache, cache_key, result)
+
+    return dict(result) if result else None
 
 def get_user_location_for_search(line_user_id: str, bot_id: str = "geodine-ai") -> Optional[Dict[str, float]]:
     """
@@ -222,45 +408,50 @@ def get_user_locations(line_user_id: str, bot_id: str = "geodine-ai", limit: int
 
 def save_user_preference(line_user_id: str, key: str, value: str, bot_id: str = "geodine-ai") -> bool:
     """Save user preference to database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_connection()
     cursor = conn.cursor()
 
     try:
-        # Get or create user
-        user_id = get_or_create_user(line_user_id, bot_id)
-        
+        # Same single-transaction upsert chain as save_user_location
+        cursor.execute("BEGIN IMMEDIATE")
+
+        user_id = _upsert_user(cursor, line_user_id, bot_id)
+
         # Insert or update preference
         cursor.execute(
             """
             INSERT INTO user_preferences (user_id, preference_key, preference_value)
             VALUES (?, ?, ?)
-            ON CONFLICT(user_id, preference_key) 
-            DO UPDATE SET preference_value = ?
-            """, 
-            (user_id, key, value, value)
+            ON CONFLICT(user_id, preference_key)
+            DO UPDATE SET preference_value = excluded.preference_value
+            """,
+            (user_id, key, value)
         )
-        
+
         conn.commit()
+        _preference_cache.pop((line_user_id, key, bot_id), None)
         result = True
     except Exception as e:
-        print(f"Error saving user preference: {str(e)}")
+        logger.error("Error saving user preference: %s", e)
         conn.rollback()
         result = False
-    finally:
-        conn.close()
-    
+
     return result
 
 def get_user_preference(line_user_id: str, key: str, bot_id: str = "geodine-ai") -> Optional[str]:
-    """Get user preference from database"""
-    conn = sqlite3.connect(DB_PATH)
+    """Get user preference from database, cached for a short TTL"""
+    cache_key = (line_user_id, key, bot_id)
+    hit, cached = _cache_get(_preference_cache, cache_key)
+    if hit:
+        return cached
+
+    conn = _get_reader_connection()
     cursor = conn.cursor()
 
     # Get bot database ID
-    cursor.execute("SELECT id FROM bots WHERE bot_id = ?", (bot_id,))
+    cursor.execute(_SQL_SELECT_BOT_ID, (bot_id,))
     bot_row = cursor.fetchone()
     if not bot_row:
-        conn.close()
         return None
 
     db_bot_id = bot_row[0]
@@ -273,7 +464,6 @@ def get_user_preference(line_user_id: str, key: str, bot_id: str = "geodine-ai")
     user = cursor.fetchone()
 
     if not user:
-        conn.close()
         return None
 
     user_id = user[0]
@@ -290,30 +480,99 @@ def get_user_preference(line_user_id: str, key: str, bot_id: str = "geodine-ai")
 
     preference = cursor.fetchone()
 
-    conn.close()
+    value = preference[0] if preference else None
+    _cache_set(_preference_cache, cache_key, value)
+
+    return value
+
+
+def persist_broadcast_results(results: List[Tuple[str, str, str, Optional[str]]]) -> bool:
+    """
+    Record per-recipient broadcast outcomes in one batch.
+
+    Each result is a (bot_id, line_user_id, status, error) tuple. The whole
+    batch goes through a single executemany inside one transaction, so a
+    large broadcast costs one fsync instead of one per row.
+    """
+    if not results:
+        return True
+
+    conn = _get_connection()
+
+    try:
+        # The connection context manager wraps the batch in one transaction
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO broadcast_log (bot_id, line_user_id, status, error)
+                VALUES (?, ?, ?, ?)
+                """,
+                results
+            )
+        return True
+    except Exception as e:
+        logger.error("Error persisting broadcast results: %s", e)
+        return False
+
+
+def get_bot_subscriber_stats(bot_id: str = "weather-ootd") -> Tuple[int, int]:
+    """
+    Get (total_subscribers, subscribers_with_location) for a bot in a single
+    query, without materializing the subscriber list in Python
+    """
+    conn = _get_reader_connection()
+    cursor = conn.cursor()
+
+    # Get bot database ID
+    cursor.execute(_SQL_SELECT_BOT_ID, (bot_id,))
+    bot_row = cursor.fetchone()
+    if not bot_row:
+        return 0, 0
+
+    cursor.execute(
+        """
+        SELECT COUNT(*), COUNT(ul.latitude)
+        FROM users u
+        LEFT JOIN user_locations ul ON u.id = ul.user_id
+        WHERE u.bot_id = ?
+        """,
+        (bot_row[0],)
+    )
 
-    return preference[0] if preference else None
+    total, with_location = cursor.fetchone()
+    return total, with_location
 
 
-def get_all_bot_subscribers(bot_id: str = "weather-ootd") -> List[Dict[str, Any]]:
+# Lightweight row type for the subscriber queries: named access like
+# sqlite3.Row, but without the per-row dict rebuild the old dict(row)
+# conversion paid for every subscriber
+SubscriberRow = namedtuple(
+    "SubscriberRow",
+    "line_user_id latitude longitude address location_name"
+)
+
+
+def iter_bot_subscribers(bot_id: str = "weather-ootd"):
     """
-    Get all users subscribed to a specific bot with their location data
-    Returns list of dicts with 'line_user_id', 'latitude', 'longitude', 'address'
-    Users without location data will have latitude/longitude as None
+    Yield users subscribed to a specific bot with their location data, one
+    SubscriberRow at a time so large subscriber lists never sit fully in
+    memory. Users without location data have latitude/longitude as None.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _get_reader_connection()
     cursor = conn.cursor()
 
     # Get bot database ID
-    cursor.execute("SELECT id FROM bots WHERE bot_id = ?", (bot_id,))
+    cursor.execute(_SQL_SELECT_BOT_ID, (bot_id,))
     bot_row = cursor.fetchone()
     if not bot_row:
-        conn.close()
-        return []
+        return
 
     db_bot_id = bot_row[0]
 
+    # Swap in the namedtuple factory for the subscriber rows only; the
+    # shared reader connection keeps sqlite3.Row for everything else
+    cursor.row_factory = lambda _cursor, row: SubscriberRow(*row)
+
     # Get all users for this bot with their location data (LEFT JOIN to include users without locations)
     cursor.execute(
         """
@@ -331,7 +590,12 @@ def get_all_bot_subscribers(bot_id: str = "weather-ootd") -> List[Dict[str, Any]
         (db_bot_id,)
     )
 
-    subscribers = cursor.fetchall()
-    conn.close()
+    yield from cursor
 
-    return [dict(row) for row in subscribers] 
\ No newline at end of file
+
+def get_all_bot_subscribers(bot_id: str = "weather-ootd") -> List[SubscriberRow]:
+    """
+    Get all users subscribed to a specific bot with their location data.
+    Thin wrapper around iter_bot_subscribers for callers needing a list.
+    """
+    return list(iter_bot_subscribers(bot_id))
\ No newline at end of file
@@ -2,6 +2,7 @@
 Base handler for LINE Bot message processing.
 Provides shared functionality for all bot handlers following Clean Architecture principles.
 """
+import logging
 from abc import ABC, abstractmethod
 from typing import Union, List
 from linebot.exceptions import LineBotApiError
@@ -10,6 +11,8 @@ from linebot.models import SendMessage
 from src.bot_registry import BotInstance
 from src.handlers.message_utils import EventDeduplicationManager
 
+logger = logging.getLogger(__name__)
+
 
 class BaseLineHandler(ABC):
     """
@@ -84,7 +87,7 @@ class BaseLineHandler(ABC):
         # Try reply first, fall back to push if needed
         try:
             self.api.reply_message(reply_token, messages)
-            print(f"Successfully replied to event {event_id}")
+            logger.debug("Successfully replied to event %s", event_id)
         except LineBotApiError as e:
             self._handle_reply_error(e, user_id, messages, event_id)
 
@@ -109,14 +112,14 @@ class BaseLineHandler(ABC):
             event_id: Event identifier for logging
         """
         if "Invalid reply token" in str(error):
-            print(f"Reply token invalid for event {event_id}, using push message")
+            logger.info("Reply token invalid for event %s, using push message", event_id)
             try:
                 self._push_messages(user_id, messages)
-                print(f"Successfully pushed message to {user_id}")
+                logger.debug("Successfully pushed message to %s", user_id)
             except Exception as push_error:
-                print(f"Error sending push message: {str(push_error)}")
+                logger.error("Error sending push message: %s", push_error)
         else:
-            print(f"LINE API Error for event {event_id}: {str(error)}")
+            logger.error("LINE API Error for event %s: %s", event_id, error)
 
     def _push_messages(
         self,
@@ -130,11 +133,9 @@ class BaseLineHandler(ABC):
             user_id: Target user ID
             messages: Message(s) to send
         """
-        if isinstance(messages, list):
-            for message in messages:
-                self.api.push_message(user_id, message)
-        else:
-            self.api.push_message(user_id, messages)
+        # The push API accepts up to 5 messages per call, so a list goes
+        # out in one round-trip instead of one request per message
+        self.api.push_message(user_id, messages)
 
     @abstractmethod
     def handle_text_message(self, event) -> None:
@@ -1,8 +1,12 @@
 """
 Shared utilities for LINE message handling
 """
+import logging
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
 
 
 class EventDeduplicationManager:
@@ -18,8 +22,19 @@ class EventDeduplicationManager:
         Args:
             expiry_seconds: How long to keep events in cache (default: 5 minutes)
         """
-        self.processed_events: Dict[str, float] = {}
+        # Ordered oldest-first: entries are inserted (or moved) with
+        # monotonically increasing timestamps, so expired ones are always
+        # at the front and cleanup never needs to scan the whole cache
+        self.processed_events: "OrderedDict[str, float]" = OrderedDict()
         self.expiry_seconds = expiry_seconds
+        # Expired entries are harmless (they only cost memory), so cleanup
+        # runs every _cleanup_every inserts instead of on every event
+        self._ops_since_cleanup = 0
+        self._cleanup_every = 1024  # power of two, see is_duplicate
+        # Webhook events for different bots are handled on different
+        # threads; without the lock two threads could both see "not
+        # duplicate" for the same event_id
+        self._lock = threading.Lock()
 
     def is_duplicate(self, event_id: str) -> bool:
         """
@@ -36,31 +51,37 @@ class EventDeduplicationManager:
 
         current_time = time.time()
 
-        # Check if event exists and hasn't expired
-        if event_id in self.processed_events:
-            if current_time - self.processed_events[event_id] < self.expiry_seconds:
-                print(f"Skipping duplicate event: {event_id}")
-                return True
+        with self._lock:
+            # Check if event exists and hasn't expired
+            if event_id in self.processed_events:
+                if current_time - self.processed_events[event_id] < self.expiry_seconds:
+                    logger.debug("Skipping duplicate event: %s", event_id)
+                    return True
 
-        # Mark event as processed
-        self.processed_events[event_id] = current_time
+            # Mark event as processed; moving refreshed entries to the end
+            # keeps the dict sorted by timestamp
+            self.processed_events[event_id] = current_time
+            self.processed_events.move_to_end(event_id)
 
-        # Clean up old events
-        self._cleanup_old_events(current_time)
+            # Clean up old events periodically; the bitmask is a cheap
+            # "every N ops" check that avoids a modulo on the hot path
+            self._ops_since_cleanup += 1
+            if self._ops_since_cleanup & (self._cleanup_every - 1) == 0:
+                self._cleanup_old_events(current_time)
 
         return False
 
     def _cleanup_old_events(self, current_time: float):
         """Remove events older than expiry time from cache"""
-        expired_ids = [
-            event_id
-            for event_id, timestamp in self.processed_events.items()
-            if current_time - timestamp > self.expiry_seconds
-        ]
-
-        for event_id in expired_ids:
-            del self.processed_events[event_id]
+        # The front of the dict is always the oldest entry, so pop from
+        # there until the first unexpired one - amortized O(1) per event
+        while self.processed_events:
+            oldest_timestamp = next(iter(self.processed_events.values()))
+            if current_time - oldest_timestamp <= self.expiry_seconds:
+                break
+            self.processed_events.popitem(last=False)
 
     def clear(self):
         """Clear all processed events from cache"""
-        self.processed_events.clear()
+        with self._lock:
+            self.processed_events.clear()
@@ -1,16 +1,96 @@
 """
 Image generation service using OpenAI Images API
 """
+import asyncio
+import functools
+import io
+import json
+import logging
 import os
 import base64
 import requests
+import string
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter, Retry
+
+from src.weather_service import WeatherService
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Condition labels by threshold, ordered high to low; the first entry the
+# value exceeds wins (matches the old if/elif chains)
+_PRECIP_BOUNDS = ((10, "大雨"), (5, "中雨"), (0, "小雨"))
+_TEMP_BOUNDS = ((30, "炎熱"), (25, "溫暖"), (18, "舒適"), (10, "涼爽"), (float("-inf"), "寒冷"))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_template(template: str) -> tuple:
+    """
+    Parse a str.format template into (literal, field, spec) segments once
+    per distinct template, so repeat formatting skips the parsing pass.
+    """
+    return tuple(
+        (literal, field, spec)
+        for literal, field, spec, _conversion in string.Formatter().parse(template)
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _payload_skeleton(model: str, size: str, quality: str) -> dict:
+    """
+    Build the constant part of the images-API payload for a
+    (model, size, quality) combination. Callers copy the dict and add the
+    prompt, so the quality/response_format branching runs once per combo.
+    """
+    payload = {
+        "model": model,
+        "n": 1,
+        "size": size
+    }
+
+    # Add quality parameter (dall-e-3 uses "hd"/"standard", gpt-image-1 uses "high"/"medium"/"low"/"auto")
+    if model == "dall-e-3":
+        # Map to dall-e-3 quality values
+        payload["quality"] = "hd" if quality in ["high", "hd"] else "standard"
+    elif model == "gpt-image-1":
+        payload["quality"] = quality
+
+    # gpt-image-1 always returns base64, dall-e-2/3 can return URLs
+    if model in ["dall-e-2", "dall-e-3"]:
+        payload["response_format"] = "url"
+
+    return payload
+
+
+@functools.lru_cache(maxsize=1024)
+def _weather_data_prompt(weather_code: int, temp_max: float, temp_min: float) -> str:
+    """Build the default weather-data prompt; pure, so results are memoized."""
+    weather_desc = WeatherService.get_weather_description(weather_code)
+    return (
+        f"Create a stylish outfit recommendation for {weather_desc} weather, "
+        f"with temperatures between {temp_min}°C and {temp_max}°C. "
+        f"The image should show a complete, fashionable outfit suitable for these conditions."
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _default_prompt(weather_context: str) -> str:
+    """Build the legacy weather-context prompt; pure, so results are memoized."""
+    return (
+        f"Create a stylish and fashionable outfit recommendation illustration for {weather_context}. "
+        f"The image should show a complete outfit laid out on a clean, minimal background. "
+        f"Include clothing items appropriate for the weather conditions, such as tops, bottoms, "
+        f"outerwear, shoes, and accessories. The style should be modern, trendy, and Instagram-worthy. "
+        f"Use a flat lay photography style with good lighting and color coordination. "
+        f"Make it visually appealing and suitable for social media sharing."
+    )
+
 
 class ImageGenerationService:
     """Service for generating images using OpenAI Images API"""
@@ -28,10 +108,32 @@ class ImageGenerationService:
             "Content-Type": "application/json"
         }
 
+        # Reuse one session across calls so the TCP+TLS connection to
+        # api.openai.com survives between requests instead of paying the
+        # handshake on every image. Transient errors and rate limits are
+        # retried with backoff at the transport level.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"]
+            )
+        )
+        self._session.mount("https://", adapter)
+
         # Create directory for storing generated images
         self.images_dir = Path("generated_images")
         self.images_dir.mkdir(exist_ok=True)
 
+        # Small pool for disk writes so callers don't block on saving
+        # multi-megabyte images after the API call returns
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="img-io")
+
     def generate_outfit_image(
         self,
         weather_data: dict = None,
@@ -73,40 +175,23 @@ class ImageGenerationService:
         else:
             prompt = "Create a stylish outfit recommendation for moderate weather conditions."
 
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "n": 1,
-            "size": size
-        }
-
-        # Add quality parameter (dall-e-3 uses "hd"/"standard", gpt-image-1 uses "high"/"medium"/"low"/"auto")
-        if model == "dall-e-3":
-            # Map to dall-e-3 quality values
-            if quality in ["high", "hd"]:
-                payload["quality"] = "hd"
-            else:
-                payload["quality"] = "standard"
-        elif model == "gpt-image-1":
-            payload["quality"] = quality
-
-        # gpt-image-1 always returns base64, dall-e-2/3 can return URLs
-        if model in ["dall-e-2", "dall-e-3"]:
-            payload["response_format"] = "url"
+        payload = dict(_payload_skeleton(model, size, quality))
+        payload["prompt"] = prompt
 
         try:
-            print(f"Generating image with prompt: {prompt}")
-            print(f"Using model: {model}, size: {size}, quality: {quality}")
+            logger.debug("Generating image with prompt: %s", prompt)
+            logger.debug("Using model: %s, size: %s, quality: %s", model, size, quality)
 
-            response = requests.post(
+            response = self._session.post(
                 self.API_ENDPOINT,
-                headers=self.headers,
                 json=payload,
                 timeout=300
             )
 
             response.raise_for_status()
-            data = response.json()
+            # Parse the raw bytes directly; response.json() would first
+            # decode the ~MiB base64 payload into an intermediate str
+            data = json.loads(response.content)
 
             if "data" in data and len(data["data"]) > 0:
                 image_data = data["data"][0]
@@ -114,7 +199,7 @@ class ImageGenerationService:
                 # gpt-image-1 returns base64, dall-e-2/3 return URL
                 if "url" in image_data:
                     image_url = image_data["url"]
-                    print(f"Image generated successfully (URL): {image_url}")
+                    logger.info("Image generated successfully (URL): %s", image_url)
                     return image_url
                 elif "b64_json" in image_data:
                     # For gpt-image-1, save the base64 image locally and return file path
@@ -124,32 +209,51 @@ class ImageGenerationService:
                     filename = f"{uuid.uuid4()}.png"
                     filepath = self.images_dir / filename
 
-                    # Decode and save
-                    image_bytes = base64.b64decode(b64_data)
-                    with open(filepath, "wb") as f:
-                        f.write(image_bytes)
+                    # The URL path only depends on the filename, so the
+                    # decode-and-write can happen off this thread
+                    self._io_pool.submit(self._write_image, filepath, b64_data)
 
-                    print(f"Image generated successfully (base64, saved to: {filepath})")
+                    logger.info("Image generated successfully (base64, saving to: %s)", filepath)
                     # Return relative path that can be served by FastAPI
                     return f"/generated_images/{filename}"
                 else:
-                    print(f"Unexpected response format: {data}")
+                    logger.warning("Unexpected response format: %s", data)
                     return None
             else:
-                print(f"Unexpected response format: {data}")
+                logger.warning("Unexpected response format: %s", data)
                 return None
 
         except requests.exceptions.Timeout:
-            print("Error: Request timed out after 300 seconds")
+            logger.error("Request timed out after 300 seconds")
             return None
         except requests.exceptions.HTTPError as e:
-            print(f"HTTP Error generating image: {e}")
-            print(f"Response: {e.response.text if e.response else 'No response'}")
+            logger.error("HTTP Error generating image: %s", e)
+            logger.error("Response: %s", e.response.text if e.response else 'No response')
             return None
         except Exception as e:
-            print(f"Error generating image: {e}")
+            logger.error("Error generating image: %s", e)
             return None
 
+    @staticmethod
+    def _write_image(filepath: Path, b64_data: str):
+        """
+        Decode base64 image data and write it to disk.
+
+        Writes to a temp file and renames into place so a request that
+        races the write sees either nothing (404) or the complete image,
+        never a truncated file.
+        """
+        tmp_path = filepath.with_suffix(".tmp")
+        try:
+            # Decode straight into the file in chunks instead of
+            # materializing the full ~MiB bytes object first
+            with open(tmp_path, "wb") as f:
+                base64.decode(io.BytesIO(b64_data.encode("ascii")), f)
+            os.replace(tmp_path, filepath)
+        except Exception as e:
+            logger.error("Error saving image to %s: %s", filepath, e)
+            tmp_path.unlink(missing_ok=True)
+
     def _format_custom_prompt(self, template: str, weather_data: dict) -> str:
         """
         Format custom prompt template with weather data
@@ -161,8 +265,6 @@ class ImageGenerationService:
         Returns:
             Formatted prompt
         """
-        from src.weather_service import WeatherService
-
         # Extract weather information
         weather_code = weather_data.get('weather_code', 0)
         temp_max = weather_data.get('temp_max', 25)
@@ -175,41 +277,28 @@ class ImageGenerationService:
         # Format temperature
         temperature = f"{temp_min}°C - {temp_max}°C"
 
-        # Build conditions string
-        conditions_parts = []
-
-        # Add precipitation info
-        if precipitation > 10:
-            conditions_parts.append("大雨")
-        elif precipitation > 5:
-            conditions_parts.append("中雨")
-        elif precipitation > 0:
-            conditions_parts.append("小雨")
-
-        # Add temperature feeling
+        # Build conditions string from the threshold tables
         avg_temp = (temp_max + temp_min) / 2
-        if avg_temp > 30:
-            conditions_parts.append("炎熱")
-        elif avg_temp > 25:
-            conditions_parts.append("溫暖")
-        elif avg_temp > 18:
-            conditions_parts.append("舒適")
-        elif avg_temp > 10:
-            conditions_parts.append("涼爽")
-        else:
-            conditions_parts.append("寒冷")
-
-        conditions = "、".join(conditions_parts) if conditions_parts else "舒適的天氣"
-
-        # Format the template
+        precip_label = next(
+            (label for bound, label in _PRECIP_BOUNDS if precipitation > bound), None
+        )
+        temp_label = next(label for bound, label in _TEMP_BOUNDS if avg_temp > bound)
+        conditions = "、".join(p for p in (precip_label, temp_label) if p)
+
+        # Format using the cached parsed template; bot templates are
+        # static per bot, so parsing happens once per template identity
+        values = {
+            "weather_description": weather_description,
+            "temperature": temperature,
+            "conditions": conditions
+        }
         try:
-            prompt = template.format(
-                weather_description=weather_description,
-                temperature=temperature,
-                conditions=conditions
+            prompt = "".join(
+                literal + (format(values[field], spec or "") if field is not None else "")
+                for literal, field, spec in _parse_template(template)
             )
         except KeyError as e:
-            print(f"Warning: Missing placeholder in template: {e}")
+            logger.warning("Missing placeholder in template: %s", e)
             # Fallback to simple formatting
             prompt = template
 
@@ -225,22 +314,12 @@ class ImageGenerationService:
         Returns:
             Generated prompt
         """
-        from src.weather_service import WeatherService
-
-        weather_code = weather_data.get('weather_code', 0)
-        temp_max = weather_data.get('temp_max', 25)
-        temp_min = weather_data.get('temp_min', 20)
-
-        weather_desc = WeatherService.get_weather_description(weather_code)
-
-        prompt = (
-            f"Create a stylish outfit recommendation for {weather_desc} weather, "
-            f"with temperatures between {temp_min}°C and {temp_max}°C. "
-            f"The image should show a complete, fashionable outfit suitable for these conditions."
+        return _weather_data_prompt(
+            weather_data.get('weather_code', 0),
+            weather_data.get('temp_max', 25),
+            weather_data.get('temp_min', 20)
         )
 
-        return prompt
-
     def _generate_default_prompt(self, weather_context: str) -> str:
         """
         Generate default prompt for outfit recommendation image (legacy support)
@@ -251,16 +330,19 @@ class ImageGenerationService:
         Returns:
             Complete prompt for DALL-E
         """
-        prompt = (
-            f"Create a stylish and fashionable outfit recommendation illustration for {weather_context}. "
-            f"The image should show a complete outfit laid out on a clean, minimal background. "
-            f"Include clothing items appropriate for the weather conditions, such as tops, bottoms, "
-            f"outerwear, shoes, and accessories. The style should be modern, trendy, and Instagram-worthy. "
-            f"Use a flat lay photography style with good lighting and color coordination. "
-            f"Make it visually appealing and suitable for social media sharing."
-        )
+        return _default_prompt(weather_context)
 
-        return prompt
+    async def generate_outfit_image_async(self, **kwargs) -> Optional[str]:
+        """
+        Async wrapper around generate_outfit_image.
+
+        Image generation blocks on the OpenAI API for seconds; calling
+        this from async code keeps the event loop free by running the
+        request on a worker thread. The pooled session means the worker
+        still reuses the warm connection. Accepts the same keyword
+        arguments as generate_outfit_image.
+        """
+        return await asyncio.to_thread(self.generate_outfit_image, **kwargs)
 
     def generate_outfit_image_dalle2(
         self,
@@ -3,8 +3,18 @@ Language pack module for GeoDine-AI.
 Contains all message strings and prompts used in the application.
 """
 
-from typing import Dict, Any
-from src.translation import translate_text
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+from src.translation import translate_text, translate_batch
 
 # Remove placeholder function
 # def _placeholder_translate(text, target_language):
@@ -13,8 +23,10 @@ from src.translation import translate_text
 # Default language is English
 DEFAULT_LANGUAGE = "en"
 
-# Bot responses
-BOT_MESSAGES = {
+# Bot responses. Read-only after import: the proxy blocks accidental
+# mutation, and interned keys make the hot get_message lookups compare
+# by pointer before falling back to full string equality
+BOT_MESSAGES: Mapping[str, str] = {
     # General messages
     "not_restaurant_related": "Sorry, I can only help with food and drink related queries.",
     "greeting": "Hello! I'm a food & drink recommendation bot. What type of food or drink would you like to find today?",
@@ -57,6 +69,7 @@ BOT_MESSAGES = {
     # Error template
     "non_restaurant_query": "I'm sorry, but I can only help with finding food and drink places. I can't assist with {query_type} queries."
 }
+BOT_MESSAGES = MappingProxyType({sys.intern(k): v for k, v in BOT_MESSAGES.items()})
 
 # Non-food/drink keywords for detection
 NON_RESTAURANT_KEYWORDS = [
@@ -65,21 +78,34 @@ NON_RESTAURANT_KEYWORDS = [
     "shopping", "buy", "purchase", "chat", "talk", "conversation"
 ]
 
-# System prompts
-SYSTEM_PROMPTS = {
+# Built once at import: O(1) membership for tokenized text, and a single
+# alternation regex that finds any keyword in one pass over the message
+_NON_RESTAURANT_SET = frozenset(NON_RESTAURANT_KEYWORDS)
+_NON_RESTAURANT_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, NON_RESTAURANT_KEYWORDS)) + r")\b",
+    re.IGNORECASE
+)
+
+# System prompts (read-only, same treatment as BOT_MESSAGES)
+SYSTEM_PROMPTS: Mapping[str, str] = {
     "language_detector": "You are a language detector. Identify the language of the text and respond with the appropriate language code (e.g., 'en', 'zh-tw', 'ja', 'ko', etc.).",
     "translator": "You are a translator. Translate the following English text to {target_language}. Only return the translated text without any explanations or notes.",
     "restaurant_intent": "You are a food and drink recommendation bot. Your main purpose is to help users find places to eat or drink. Determine if the user's message is related to finding food, beverages, or dining establishments, or if it's a different type of request.",
     "restaurant_analyzer": "You are a helpful assistant that analyzes food and drink establishments to find the best matches for user requests. Consider all types of places including restaurants, cafes, bubble tea shops, dessert places, street food, bars, and other food and beverage locations."
 }
+SYSTEM_PROMPTS = MappingProxyType({sys.intern(k): v for k, v in SYSTEM_PROMPTS.items()})
 
 # Greeting patterns (regular expressions)
 GREETING_PATTERNS = [
-    r'^hi\b', r'^hello\b', r'^hey\b', r'^what\'?s up\b', 
+    r'^hi\b', r'^hello\b', r'^hey\b', r'^what\'?s up\b',
     r'^good morning\b', r'^good afternoon\b', r'^good evening\b',
     r'^help\b', r'^howdy\b', r'^yo\b'
 ]
 
+# Compiled once at import: a single alternation scans the text in one
+# pass instead of one re call per pattern on every message
+_GREETING_RE = re.compile("|".join(f"(?:{p})" for p in GREETING_PATTERNS), re.IGNORECASE)
+
 # OpenAI function definitions
 RESTAURANT_INTENT_FUNCTIONS = [
     {
@@ -133,29 +159,117 @@ RESTAURANT_INTENT_FUNCTIONS = [
     }
 ]
 
+# Serialized once at import; the definitions are static and sent
+# verbatim with every intent-detection request, so direct-REST callers
+# can reuse the prebuilt JSON instead of re-walking the nested dicts
+_RESTAURANT_INTENT_FUNCTIONS_JSON = json.dumps(RESTAURANT_INTENT_FUNCTIONS)
+
+@lru_cache(maxsize=2048)
+def _translate_cached(message: str, language: str) -> str:
+    """
+    Translate a message and memoize the result.
+
+    The (message, language) space is small and deterministic, so repeat
+    lookups skip the translator round-trip entirely. Tests can reset via
+    _translate_cached.cache_clear().
+    """
+    return translate_text(message, language)
+
+
+# Full catalog per locale, built lazily: the first lookup in a new
+# language translates all of BOT_MESSAGES in one batched call, after
+# which every lookup is a plain dict read
+_TRANSLATED: Dict[str, Dict[str, str]] = {DEFAULT_LANGUAGE: BOT_MESSAGES}
+_locale_lock = threading.Lock()
+
+# Translated catalogs are persisted so restarts don't re-pay the
+# translator cost. The file name embeds a hash of the English source, so
+# editing BOT_MESSAGES invalidates stale translations automatically.
+_SRC_HASH = hashlib.sha1(
+    json.dumps(dict(BOT_MESSAGES), sort_keys=True).encode()
+).hexdigest()[:12]
+_CACHE_DIR = Path(
+    os.getenv("GEODINE_TRANSLATION_CACHE_DIR")
+    or Path.home() / ".cache" / "geodine"
+)
+_CACHE_FILE = _CACHE_DIR / f"translations-{_SRC_HASH}.json"
+
+
+def _load_translation_cache():
+    """Seed _TRANSLATED from the on-disk cache, if one matches the source."""
+    try:
+        with open(_CACHE_FILE, encoding="utf-8") as f:
+            for language, catalog in json.load(f).items():
+                if language != DEFAULT_LANGUAGE and isinstance(catalog, dict):
+                    _TRANSLATED[language] = catalog
+    except (OSError, ValueError):
+        # Missing or unreadable cache just means a cold start
+        pass
+
+
+def _save_translation_cache():
+    """Atomically write the translated catalogs back to disk."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        payload = {
+            language: catalog
+            for language, catalog in _TRANSLATED.items()
+            if language != DEFAULT_LANGUAGE
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, _CACHE_FILE)
+    except OSError:
+        # Persisting is best-effort; the in-memory catalog still works
+        pass
+
+
+_load_translation_cache()
+
+
+def _ensure_locale(language: str) -> Dict[str, str]:
+    """Get the message catalog for a language, translating it on first use."""
+    catalog = _TRANSLATED.get(language)
+    if catalog is None:
+        with _locale_lock:
+            catalog = _TRANSLATED.get(language)
+            if catalog is None:
+                keys = list(BOT_MESSAGES)
+                translated = translate_batch([BOT_MESSAGES[k] for k in keys], language)
+                catalog = dict(zip(keys, translated))
+                _TRANSLATED[language] = catalog
+                _save_translation_cache()
+    return catalog
+
+
 def get_message(key: str, language: str = DEFAULT_LANGUAGE, **kwargs) -> str:
     """
     Get a message from the language pack and translate it if needed.
-    
+
     Args:
         key: The message key
         language: Target language code (e.g., 'en', 'zh-tw')
         **kwargs: Format parameters to apply to the message
-        
+
     Returns:
         Translated message string
     """
-    # Get the message from the language pack
-    message = BOT_MESSAGES.get(key, f"[Missing message: {key}]")
-    
+    # Get the message from the locale catalog; a new locale is translated
+    # whole in one batched call on first use
+    message = _ensure_locale(language).get(key, f"[Missing message: {key}]")
+
     # Apply any format parameters
     if kwargs:
-        message = message.format(**kwargs)
-    
-    # Translate if needed
-    if language != DEFAULT_LANGUAGE:
-        message = translate_text(message, language)
-    
+        try:
+            message = message.format(**kwargs)
+        except (KeyError, IndexError):
+            # The translator mangled a placeholder; fall back to
+            # formatting the original and translating the full message
+            message = BOT_MESSAGES.get(key, f"[Missing message: {key}]").format(**kwargs)
+            if language != DEFAULT_LANGUAGE:
+                message = _translate_cached(message, language)
+
     return message
 
 def get_system_prompt(key: str, **kwargs) -> str:
@@ -181,12 +295,23 @@ def get_system_prompt(key: str, **kwargs) -> str:
 def get_restaurant_intent_functions() -> list:
     """
     Get the function definitions for food and drink intent detection.
-    
+
+    The definitions are shared; callers must treat them as read-only.
+
     Returns:
         List of function definitions
     """
     return RESTAURANT_INTENT_FUNCTIONS
 
+def get_restaurant_intent_functions_json() -> str:
+    """
+    Get the function definitions pre-serialized as a JSON string.
+
+    Returns:
+        JSON string of the function definitions, built once at import
+    """
+    return _RESTAURANT_INTENT_FUNCTIONS_JSON
+
 def get_greeting_patterns() -> list:
     """
     Get the greeting patterns for detecting greetings.
@@ -196,6 +321,27 @@ def get_greeting_patterns() -> list:
     """
     return GREETING_PATTERNS
 
+def get_greeting_regex() -> "re.Pattern":
+    """
+    Get the precompiled combined greeting regex.
+
+    Returns:
+        Compiled pattern matching any greeting at the start of the text
+    """
+    return _GREETING_RE
+
+def match_greeting(text: str) -> bool:
+    """
+    Check whether the text starts with a greeting.
+
+    Args:
+        text: The text to check
+
+    Returns:
+        True if the text matches any greeting pattern
+    """
+    return _GREETING_RE.match(text) is not None
+
 def get_non_restaurant_keywords() -> list:
     """
     Get the keywords for detecting non-food/drink queries.
@@ -205,6 +351,23 @@ def get_non_restaurant_keywords() -> list:
     """
     return NON_RESTAURANT_KEYWORDS
 
+def find_non_restaurant_keyword(text: str) -> str:
+    """
+    Find the first non-food/drink keyword in the text.
+
+    Scans with a precompiled alternation so the whole keyword list is
+    checked in one pass over the message.
+
+    Args:
+        text: The text to scan
+
+    Returns:
+        The matched keyword (lowercased), or an empty string if none match
+    """
+    match = _NON_RESTAURANT_RE.search(text)
+    return match.group(0).lower() if match else ""
+
+@lru_cache(maxsize=32)
 def get_preference_questions(language: str = DEFAULT_LANGUAGE) -> list:
     """
     Get the preference questions to ask users after they share their location.
@@ -226,6 +389,7 @@ def get_preference_questions(language: str = DEFAULT_LANGUAGE) -> list:
     
     return questions
 
+@lru_cache(maxsize=32)
 def get_generic_terms(language: str = DEFAULT_LANGUAGE) -> list:
     """
     Get the generic terms for detecting "any" food/drink requests in the specified language.
@@ -247,6 +411,7 @@ def get_generic_terms(language: str = DEFAULT_LANGUAGE) -> list:
     
     return terms
 
+@lru_cache(maxsize=32)
 def get_ui_labels(language: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
     """
     Get the UI labels for the food/drink carousel in the specified language.
@@ -1,9 +1,13 @@
 """
 LINE Bot webhook endpoints - refactored to support multiple bots
 """
+import base64
+import functools
+import hashlib
+import hmac
+import logging
 import os
-from fastapi import APIRouter, Request, HTTPException, Header
-from linebot.exceptions import InvalidSignatureError
+from fastapi import APIRouter, BackgroundTasks, Request, HTTPException, Header
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
@@ -16,21 +20,63 @@ from src.weather_bot_handler import register_weather_bot_handlers
 # Load environment variables
 load_dotenv()
 
-# Initialize database
-init_db()
+logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter(prefix="/line", tags=["LINE Bot"])
 
 
+@functools.lru_cache(maxsize=1)
+def _bootstrap() -> bool:
+    """
+    One-time process initialization, run on the first webhook instead of
+    at import so importing this module stays side-effect free (tests and
+    tooling can import it without touching the database file).
+    """
+    init_db()
+    return True
+
+
 class LineWebhookRequest(BaseModel):
     destination: str
     events: List[Dict[str, Any]]
 
 
-def create_webhook_endpoint(bot_id: str, webhook_path: str):
+# LINE webhook payloads are small (batches of up to 100 events); anything
+# bigger than this is not a legitimate webhook and is rejected early
+MAX_WEBHOOK_BODY_BYTES = 1 << 20
+
+
+async def _read_body_capped(request: Request) -> bytes:
     """
-    Create a webhook endpoint for a specific bot
+    Read the request body in chunks, rejecting oversize payloads before
+    buffering them fully.
+    """
+    # Honest clients declare their size up front; reject those without
+    # reading a single byte. The streaming cap below still guards
+    # against clients that lie about (or omit) Content-Length.
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_WEBHOOK_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="Webhook payload too large")
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_WEBHOOK_BODY_BYTES:
+            raise HTTPException(status_code=413, detail="Webhook payload too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_handler(bot_id: str):
+    """
+    Build (and memoize) the webhook handler for a bot.
+
+    Registering handlers is not idempotent - doing it twice would
+    double-dispatch every event - so reloads and repeat endpoint
+    creation must reuse the existing handler.
     """
     bot_instance = bot_registry.get_bot(bot_id)
 
@@ -39,30 +85,58 @@ def create_webhook_endpoint(bot_id: str, webhook_path: str):
 
     # Register handlers based on bot type
     if bot_instance.bot_type == "weather":
-        handler = register_weather_bot_handlers(bot_instance)
-    else:
-        # Default to restaurant bot handlers
-        handler = register_bot_handlers(bot_instance)
+        return register_weather_bot_handlers(bot_instance)
+    # Default to restaurant bot handlers
+    return register_bot_handlers(bot_instance)
+
+
+def create_webhook_endpoint(bot_id: str, webhook_path: str):
+    """
+    Create a webhook endpoint for a specific bot
+    """
+    handler = _build_handler(bot_id)
+    # Secret bytes precomputed once so the per-request HMAC runs straight
+    # on the raw body
+    secret_bytes = bot_registry.get_bot(bot_id).config.channel_secret.encode("utf-8")
+
+    def handle_events(body_str: str, signature: str):
+        """Run the (blocking) event handling off the request cycle"""
+        try:
+            handler.handle(body_str, signature)
+        except Exception as e:
+            logger.error("Error handling webhook for bot %s: %s", bot_id, e)
 
     async def webhook_handler(
         request: Request,
+        background_tasks: BackgroundTasks,
         x_line_signature: Optional[str] = Header(None, alias="X-Line-Signature")
     ):
         """
         Handle webhook events from the LINE platform for a specific bot
         """
-        body = await request.body()
+        _bootstrap()
+
+        body = await _read_body_capped(request)
+
+        # Verify the signature on the raw bytes (the SDK validator would
+        # re-encode a decoded str first), so forged payloads are rejected
+        # before the body is even decoded. Then acknowledge immediately
+        # and process events after the response: replying to a message
+        # blocks on LINE's API, and making the webhook wait on that
+        # round-trip pushes p99 latency high enough for LINE to retry
+        expected = base64.b64encode(
+            hmac.new(secret_bytes, body, hashlib.sha256).digest()
+        ).decode("ascii")
+        if not hmac.compare_digest(expected, x_line_signature or ""):
+            raise HTTPException(status_code=400, detail="Invalid LINE signature")
+
         body_str = body.decode("utf-8")
 
-        try:
-            # Print webhook event for debugging
-            print(f"Received LINE webhook for bot {bot_id}: {body_str[:100]}...")
-            handler.handle(body_str, x_line_signature)
-        except InvalidSignatureError:
-            raise HTTPException(status_code=400, detail="Invalid LINE signature")
-        except Exception as e:
-            print(f"Error handling webhook for bot {bot_id}: {str(e)}")
-            # Don't raise exception here to always return 200 OK to LINE
+        # Formatting (including the body slice) is deferred until a
+        # handler at DEBUG level actually consumes the record
+        logger.debug("Received LINE webhook for bot %s: %.100s...", bot_id, body_str)
+
+        background_tasks.add_task(handle_events, body_str, x_line_signature)
 
         return {"status": "OK"}
 
@@ -88,4 +162,4 @@ for bot_id, bot_instance in bot_registry.get_all_bots().items():
         summary=f"Webhook endpoint for {bot_instance.name}"
     )
 
-    print(f"Registered webhook endpoint: /line{webhook_path} for bot {bot_id}")
+    logger.info("Registered webhook endpoint: /line%s for bot %s", webhook_path, bot_id)
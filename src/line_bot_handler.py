@@ -2,6 +2,10 @@
 LINE Bot message handlers - Restaurant bot handler
 Refactored to use clean architecture with base handler
 """
+import functools
+import json
+import logging
+
 from linebot.models import (
     MessageEvent, TextMessage, LocationMessage,
     TextSendMessage, FlexSendMessage
@@ -10,10 +14,77 @@ from linebot.models import (
 from src.restaurant_finder import search_restaurants
 from src.utils import parse_user_request, parse_user_request_with_ai, analyze_and_select_restaurants, is_restaurant_related
 from src.translation import detect_language, translate_text
+from src.language_pack import get_generic_terms, get_ui_labels
 from src.database import save_user_location, get_user_location_for_search
 from src.bot_registry import BotInstance
 from src.handlers.base_handler import BaseLineHandler
 
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PHOTO_URL = "https://via.placeholder.com/300x200"
+
+# Terms signalling a generic "anything nearby" request; built once
+# instead of per message
+_GENERIC_TERMS_EN = ("any", "anything", "general", "whatever", "any restaurant", "any food")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_request_cached(text: str, use_ai: bool):
+    """
+    Parse a user request, memoized on the stripped text.
+
+    Identical free-text prompts ("japanese food", "ramen") recur across
+    users, and the AI parser pays an LLM round-trip per call; a repeat
+    prompt becomes a dict lookup. Callers must copy the result before
+    mutating it so the cached dict stays pristine.
+    """
+    if use_ai:
+        return parse_user_request_with_ai(text)
+    return parse_user_request(text)
+
+# Static bubble skeleton serialized once; each bubble starts as
+# json.loads of this string (a C-level deep copy) and only the four
+# variable fields get assigned, instead of rebuilding the nested dicts
+# per restaurant
+_BUBBLE_TEMPLATE_JSON = json.dumps({
+    "type": "bubble",
+    "hero": {
+        "type": "image",
+        "url": _DEFAULT_PHOTO_URL,
+        "size": "full",
+        "aspectRatio": "20:13",
+        "aspectMode": "cover"
+    },
+    "body": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "text",
+                "text": "Restaurant",
+                "weight": "bold",
+                "size": "xl",
+                "wrap": True
+            }
+        ]
+    },
+    "footer": {
+        "type": "box",
+        "layout": "vertical",
+        "contents": [
+            {
+                "type": "button",
+                "action": {
+                    "type": "uri",
+                    "label": "View in Google Maps",
+                    "uri": ""
+                },
+                "style": "primary"
+            }
+        ]
+    }
+})
+
 
 class RestaurantBotHandler(BaseLineHandler):
     """
@@ -24,6 +95,8 @@ class RestaurantBotHandler(BaseLineHandler):
     def __init__(self, bot_instance: BotInstance):
         """Initialize restaurant bot handler"""
         super().__init__(bot_instance)
+        # Resolved once; used as the cache key flag for every message
+        self._use_ai = bot_instance.use_ai_parsing
 
     def handle_text_message(self, event):
         """Handle text messages, parse user requests"""
@@ -32,7 +105,7 @@ class RestaurantBotHandler(BaseLineHandler):
 
         # Detect language
         language = detect_language(text)
-        print(f"Detected language: {language}")
+        logger.debug("Detected language: %s", language)
 
         # Save original query for later use
         original_query = text
@@ -42,10 +115,8 @@ class RestaurantBotHandler(BaseLineHandler):
             'not_restaurant_related': "Sorry, I can only help with food and drink related queries.",
             'greeting': "Hello! I'm a food & drink recommendation bot. What type of food or drink would you like to find today?",
             'location_needed': "Please share your location first so I can find food and drink places nearby.",
-            'searching_generic': "Looking for food and drink places near your location...",
             'location_request': "Please share your location so I can find food and drink places nearby",
-            'location_error': "I couldn't determine your location. Please share your location and try again.",
-            'searching_criteria': "Searching for food and drink places matching your criteria..."
+            'location_error': "I couldn't determine your location. Please share your location and try again."
         }
 
         # First, check if the message is related to finding food or drink
@@ -70,27 +141,17 @@ class RestaurantBotHandler(BaseLineHandler):
             self.safe_reply_or_push(event, TextSendMessage(text=response_text))
             return
 
-        # Check if text is "Any" (user wants generic recommendations)
-        # Define only English generic terms
-        generic_terms_en = ["any", "anything", "general", "whatever", "any restaurant", "any food"]
-
-        # Translate generic terms to the user's language if needed
-        is_generic_query = False
-
-        # First check if any English term is in the input (for English users)
+        # Check if text is "Any" (user wants generic recommendations);
+        # lowercase the input once and scan the module-level constants
+        # (non-English terms come from the cached language pack, so no
+        # translator call after the first message per language)
+        text_lower = text.lower()
         if language == 'en':
-            for term in generic_terms_en:
-                if term.lower() in text.lower():
-                    is_generic_query = True
-                    break
+            is_generic_query = any(term in text_lower for term in _GENERIC_TERMS_EN)
         else:
-            # For non-English users, translate each generic term to their language
-            # and check if any of those translations appear in their input
-            for term in generic_terms_en:
-                translated_term = translate_text(term, language).lower()
-                if translated_term in text.lower():
-                    is_generic_query = True
-                    break
+            is_generic_query = any(
+                term.lower() in text_lower for term in get_generic_terms(language)
+            )
 
         if is_generic_query:
             # Get user's location directly in the correct format for Google Maps API
@@ -110,34 +171,27 @@ class RestaurantBotHandler(BaseLineHandler):
                 "keyword": "food"  # Use keyword instead of type to find all food establishments
             }
 
-            # Inform user and search
-            response_text = translate_text(messages['searching_generic'], language)
-
-            self.safe_reply_or_push(event, TextSendMessage(text=response_text))
-
-            # Then search and push results
-            self.search_and_push(query_params, user_id, original_query, language)
+            # Search and send ack + results in a single reply
+            self.search_and_reply(query_params, event, original_query, language)
             return
 
-        # Parse user request (with AI if enabled)
-        if self.bot_instance.use_ai_parsing:
-            query_params = parse_user_request_with_ai(text)
-        else:
-            query_params = parse_user_request(text)
+        # Parse user request (with AI if enabled), memoized on the text;
+        # shallow copy so assigning location/language below doesn't
+        # poison the cached entry
+        query_params = dict(_parse_request_cached(text.strip(), self._use_ai))
 
-        # Debug log to help diagnose issues
-        print(f"Query params after parsing: {query_params}")
+        # Debug log to help diagnose issues; %s keeps the formatting lazy
+        logger.debug("Query params after parsing: %s", query_params)
 
         # If no location in parameters, check if user has saved location
         if "location" not in query_params or not query_params["location"]:
             # Get user's location directly in the correct format
             location = get_user_location_for_search(user_id, self.bot_id)
-            print(f"Retrieved location from database: {location}")
+            logger.debug("Retrieved location from database: %s", location)
 
             if location:
                 # Use the stored location
                 query_params['location'] = location
-                print(f"Using saved location: {location}")
             else:
                 # If no location, ask user to share location
                 response_text = translate_text(messages['location_request'], language)
@@ -152,16 +206,11 @@ class RestaurantBotHandler(BaseLineHandler):
             self.safe_reply_or_push(event, TextSendMessage(text=response_text))
             return
 
-        # First acknowledge the request
-        response_text = translate_text(messages['searching_criteria'], language)
-
-        self.safe_reply_or_push(event, TextSendMessage(text=response_text))
-
         # Final debug log before search
-        print(f"Final query params before search: {query_params}")
+        logger.debug("Final query params before search: %s", query_params)
 
-        # Then search and push results
-        self.search_and_push(query_params, user_id, original_query, language)
+        # Search and send ack + results in a single reply
+        self.search_and_reply(query_params, event, original_query, language)
 
     def handle_location_message(self, event):
         """Handle location messages, save to DB and ask for food/drink preferences"""
@@ -170,7 +219,7 @@ class RestaurantBotHandler(BaseLineHandler):
         longitude = event.message.longitude
         address = event.message.address if hasattr(event.message, 'address') else None
 
-        print(f"Received location from user {user_id}: {latitude}, {longitude}")
+        logger.debug("Received location from user %s: %s, %s", user_id, latitude, longitude)
 
         # Save user location to database (will update if exists)
         location_id = save_user_location(
@@ -206,8 +255,16 @@ class RestaurantBotHandler(BaseLineHandler):
         # Use safe reply method
         self.safe_reply_or_push(event, TextSendMessage(text="\n".join(preference_questions)))
 
-    def search_and_push(self, query_params, user_id, original_query="", language="en"):
-        """Search for food/drink establishments and push results to user"""
+    def search_and_reply(self, query_params, event, original_query="", language="en"):
+        """
+        Search for food/drink establishments and send the results.
+
+        Sends the acknowledgement text and the carousel together in one
+        reply_message (LINE allows up to 5 messages per reply) instead of
+        an ack reply followed by a push - one HTTPS round-trip to LINE
+        per query instead of two. safe_reply_or_push falls back to a push
+        if the search outlived the reply-token window.
+        """
         try:
             # Set language for search
             query_params["language"] = language
@@ -225,13 +282,10 @@ class RestaurantBotHandler(BaseLineHandler):
             if not all_results or len(all_results) == 0:
                 response_text = translate_text(messages['no_results'], language)
 
-                self.api.push_message(
-                    user_id,
-                    TextSendMessage(text=response_text)
-                )
+                self.safe_reply_or_push(event, TextSendMessage(text=response_text))
                 return
 
-            print(f"Found {len(all_results)} places from Google Maps API")
+            logger.debug("Found %d places from Google Maps API", len(all_results))
 
             # Use ChatGPT to analyze and select top places
             selected_results = analyze_and_select_restaurants(
@@ -244,101 +298,62 @@ class RestaurantBotHandler(BaseLineHandler):
             # Check if we have selected places
             if not selected_results:
                 # Fallback to the original results
-                print("No places selected by AI, using top results")
+                logger.info("No places selected by AI, using top results")
                 selected_results = [{"restaurant": r, "explanation": "", "highlight": ""} for r in all_results[:3]]
 
             # Create carousel with the selected places
             carousel_message = self.create_restaurant_carousel(selected_results, language)
 
-            # Use push message to send the carousel
+            # Ack text + carousel go out together in one API call
             alt_text_template = f"Here are {len(selected_results)} recommended places for you"
             alt_text = translate_text(alt_text_template, language)
 
-            self.api.push_message(
-                user_id,
+            self.safe_reply_or_push(event, [
+                TextSendMessage(text=alt_text),
                 FlexSendMessage(
                     alt_text=alt_text,
                     contents=carousel_message
                 )
-            )
+            ])
         except Exception as e:
-            print(f"Error searching places: {str(e)}")
+            logger.error("Error searching places: %s", e)
 
             error_message = translate_text(messages['error'], language) + str(e)
 
-            self.api.push_message(
-                user_id,
-                TextSendMessage(text=error_message)
-            )
+            self.safe_reply_or_push(event, TextSendMessage(text=error_message))
 
     def create_restaurant_carousel(self, selected_restaurants, language="en"):
         """Create a carousel message with the selected restaurants"""
         bubbles = []
 
-        # English UI labels - will be translated as needed
-        ui_labels = {
-            'view_map': "View in Google Maps",
-            'rating': "Rating",
-            'reviews': "reviews",
-            'price': "Price",
-            'address': "Address"
-        }
+        # Cached per language; no translator work after the first carousel
+        translated_labels = get_ui_labels(language)
 
-        # Translate all UI labels
-        translated_labels = {}
-        for key, value in ui_labels.items():
-            translated_labels[key] = translate_text(value, language)
+        # Hoist the label formatting out of the per-restaurant loop
+        view_map_label = translated_labels['view_map']
+        rating_prefix = translated_labels['rating'] + ": "
+        reviews_label = translated_labels['reviews']
+        price_prefix = translated_labels['price'] + ": "
+        address_prefix = translated_labels['address'] + ": "
 
         for selected in selected_restaurants:
             restaurant = selected.get("restaurant", {})
             explanation = selected.get("explanation", "")
             highlight = selected.get("highlight", "")
 
-            # Create a bubble for each restaurant
-            bubble = {
-                "type": "bubble",
-                "hero": {
-                    "type": "image",
-                    "url": restaurant.get("photo_url", "https://via.placeholder.com/300x200"),
-                    "size": "full",
-                    "aspectRatio": "20:13",
-                    "aspectMode": "cover"
-                },
-                "body": {
-                    "type": "box",
-                    "layout": "vertical",
-                    "contents": [
-                        {
-                            "type": "text",
-                            "text": restaurant.get("name", "Restaurant"),
-                            "weight": "bold",
-                            "size": "xl",
-                            "wrap": True
-                        }
-                    ]
-                },
-                "footer": {
-                    "type": "box",
-                    "layout": "vertical",
-                    "contents": [
-                        {
-                            "type": "button",
-                            "action": {
-                                "type": "uri",
-                                "label": translated_labels['view_map'],
-                                "uri": f"https://www.google.com/maps/place/?q=place_id:{restaurant.get('place_id', '')}"
-                            },
-                            "style": "primary"
-                        }
-                    ]
-                }
-            }
+            # Create a bubble for each restaurant from the static skeleton
+            bubble = json.loads(_BUBBLE_TEMPLATE_JSON)
+            bubble["hero"]["url"] = restaurant.get("photo_url", _DEFAULT_PHOTO_URL)
+            bubble["body"]["contents"][0]["text"] = restaurant.get("name", "Restaurant")
+            action = bubble["footer"]["contents"][0]["action"]
+            action["label"] = view_map_label
+            action["uri"] = f"https://www.google.com/maps/place/?q=place_id:{restaurant.get('place_id', '')}"
 
             # Add rating if available
             if "rating" in restaurant:
-                rating_text = f"{translated_labels['rating']}: {restaurant.get('rating', 'N/A')}"
+                rating_text = rating_prefix + str(restaurant.get('rating', 'N/A'))
                 if restaurant.get('user_ratings_total'):
-                    rating_text += f" ({restaurant.get('user_ratings_total')} {translated_labels['reviews']})"
+                    rating_text += f" ({restaurant.get('user_ratings_total')} {reviews_label})"
 
                 bubble["body"]["contents"].append({
                     "type": "box",
@@ -363,7 +378,7 @@ class RestaurantBotHandler(BaseLineHandler):
                 price_level = int(price_level) if price_level is not None else 0
                 price_symbols = "💰" * price_level
 
-                price_text = f"{translated_labels['price']}: {price_symbols or 'N/A'}"
+                price_text = price_prefix + (price_symbols or 'N/A')
 
                 bubble["body"]["contents"].append({
                     "type": "box",
@@ -382,7 +397,7 @@ class RestaurantBotHandler(BaseLineHandler):
 
             # Add address if available
             if "address" in restaurant:
-                address_text = f"{translated_labels['address']}: {restaurant.get('address', 'N/A')}"
+                address_text = address_prefix + str(restaurant.get('address', 'N/A'))
 
                 bubble["body"]["contents"].append({
                     "type": "box",
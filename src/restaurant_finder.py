@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 import googlemaps
 from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
@@ -20,6 +22,16 @@ gmaps = googlemaps.Client(key=os.getenv("GOOGLE_MAPS_API_KEY"))
 
 router = APIRouter(prefix="/restaurants", tags=["Restaurant Finder"])
 
+# Short-TTL result cache with per-key singleflight: concurrent identical
+# searches (same neighborhood, radius, keyword) coalesce into one Places
+# call instead of each paying the API round-trip and quota. Locations
+# are rounded to 3 decimals (~110m) when building the key.
+_SEARCH_CACHE_TTL = 120.0
+_SEARCH_CACHE_MAX = 2048
+_search_cache: Dict[tuple, Tuple[float, list]] = {}
+_search_locks: Dict[tuple, threading.Lock] = {}
+_search_locks_guard = threading.Lock()
+
 class RestaurantSearchRequest(BaseModel):
     location: Union[Tuple[float, float], Dict[str, float]]  # (latitude, longitude) or {"lat": lat, "lng": lng}
     keyword: Optional[str] = None
@@ -169,15 +181,57 @@ def search_restaurants(params):
     if "language" in params and params["language"]:
         api_params["language"] = params["language"]
     
+    cache_key = (
+        round(location["lat"], 3),
+        round(location["lng"], 3),
+        api_params["radius"],
+        api_params.get("type"),
+        api_params.get("keyword"),
+        api_params["open_now"],
+        api_params.get("min_price"),
+        api_params.get("language"),
+    )
+
+    # Fast path: a fresh cached result for the same search
+    cached = _search_cache.get(cache_key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    with _search_locks_guard:
+        lock = _search_locks.setdefault(cache_key, threading.Lock())
+
+    with lock:
+        # Another thread may have finished the same search while we waited
+        cached = _search_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        restaurants = _fetch_restaurants(api_params)
+
+        if len(_search_cache) >= _SEARCH_CACHE_MAX:
+            now = time.monotonic()
+            expired = [key for key, (expires, _) in _search_cache.items() if expires <= now]
+            with _search_locks_guard:
+                for key in expired:
+                    _search_cache.pop(key, None)
+                    _search_locks.pop(key, None)
+        _search_cache[cache_key] = (time.monotonic() + _SEARCH_CACHE_TTL, restaurants)
+
+    return restaurants
+
+def _fetch_restaurants(api_params):
+    """
+    Call the Google Maps Places API and shape the raw results
+    """
     # Debug log for API call
     print(f"Calling Google Maps API with params: {api_params}")
-    
+
     # Call Google Maps Places API
     places_result = gmaps.places_nearby(**api_params)
-    
+
     # Debug log for results
     print(f"Got {len(places_result.get('results', []))} results from Google Maps API")
-    
+
     # Process results
     restaurants = []
     for place in places_result.get("results", []):
@@ -188,7 +242,7 @@ def search_restaurants(params):
         photo_url = None
         if "photos" in place and place["photos"]:
             photo_reference = place["photos"][0]["photo_reference"]
-            photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo_reference}&key={os.getenv('GOOGLE_MAPS_API_KEY')}"
+            photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference={photo_reference}&key={api_key}"
         
         restaurant = {
             "name": place["name"],
@@ -69,6 +69,55 @@ def translate_text(text: str, target_language: str) -> str:
         # Return original text if translation fails
         return text
 
+def translate_batch(texts: list, target_language: str) -> list:
+    """
+    Translate a list of English strings in a single ChatGPT call.
+
+    One request for the whole batch instead of one per string; used to
+    translate a full message catalog when a new locale is first seen.
+
+    Args:
+        texts: List of texts to translate (in English)
+        target_language: The target language code (e.g., 'zh-tw', 'ja', 'ko')
+
+    Returns:
+        List of translated texts, in the same order as the input
+    """
+    # If the target language is English or not specified, return the originals
+    if not target_language or target_language == 'en' or not texts:
+        return list(texts)
+
+    numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+
+    try:
+        # Use ChatGPT to translate all lines at once
+        response = client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": f"You are a translator. Translate each numbered English line to {target_language}. Keep the numbering and any placeholders like {{query_type}} exactly as they are. Only return the translated numbered lines without any explanations or notes."},
+                {"role": "user", "content": numbered}
+            ],
+            temperature=0.3,
+            max_tokens=2000
+        )
+
+        # Parse the numbered lines back into order
+        translated = {}
+        for line in response.choices[0].message.content.strip().splitlines():
+            match = re.match(r'\s*(\d+)\.\s?(.*)', line)
+            if match:
+                translated[int(match.group(1))] = match.group(2).strip()
+
+        if len(translated) == len(texts):
+            return [translated[i] for i in range(1, len(texts) + 1)]
+        print(f"Batch translation returned {len(translated)}/{len(texts)} lines, falling back")
+
+    except Exception as e:
+        print(f"Error batch-translating text with ChatGPT: {str(e)}")
+
+    # Fall back to per-string translation (each call is cached)
+    return [translate_text(text, target_language) for text in texts]
+
 def detect_language(text: str) -> str:
     """
     Detect the language of input text using ChatGPT.
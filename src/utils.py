@@ -6,14 +6,37 @@ from typing import Dict, Any, Tuple, List
 from openai import OpenAI
 from src.translation import translate_text, detect_language
 from src.language_pack import (
-    get_system_prompt, get_greeting_patterns, 
-    get_non_restaurant_keywords, get_message, 
+    get_system_prompt, match_greeting,
+    find_non_restaurant_keyword, get_message,
     get_restaurant_intent_functions
 )
 
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Frozen at import so the hot path never touches os.environ
+USE_AI_PARSING = os.getenv("USE_AI_PARSING", "False").lower() == "true"
+
+# Keywords signalling a food/drink query, built once instead of per call
+FOOD_DRINK_KEYWORDS = frozenset({
+    # English food keywords
+    "food", "eat", "restaurant", "dining", "meal", "lunch", "dinner", "breakfast", "brunch",
+    "cuisine", "menu", "dishes", "snack", "street food", "take out", "takeaway", "delivery",
+    # English drink keywords
+    "drink", "coffee", "cafe", "tea", "bubble tea", "boba", "milk tea", "juice", "bar",
+    "alcohol", "beer", "wine", "cocktail", "beverage",
+    # English dessert/bakery keywords
+    "dessert", "cake", "ice cream", "sweet", "bakery", "pastry", "bread",
+    # Chinese food keywords
+    "食物", "吃", "餐廳", "用餐", "餐點", "午餐", "晚餐", "早餐", "早午餐",
+    "菜系", "菜單", "菜色", "小吃", "路邊攤", "外帶", "外送",
+    # Chinese drink keywords
+    "飲料", "咖啡", "茶", "珍珠奶茶", "手搖杯", "果汁", "酒吧",
+    "酒", "啤酒", "葡萄酒", "調酒", "飲品",
+    # Chinese dessert/bakery keywords
+    "甜點", "蛋糕", "冰淇淋", "甜食", "麵包店", "糕點", "麵包"
+})
+
 # Language detection cache to avoid repeated API calls
 language_cache = {}
 MAX_CACHE_SIZE = 1000
@@ -38,15 +61,12 @@ def is_restaurant_related(text: str) -> Tuple[bool, str]:
     language = detect_language(text)
     text_lower = text.lower()
     
-    # Get greeting patterns from language pack
-    greeting_patterns = get_greeting_patterns()
-    
     # Check for greeting patterns
     # For English input
     if language == 'en':
-        for pattern in greeting_patterns:
-            if re.search(pattern, text_lower):
-                return True, get_message("greeting_short")
+        # One precompiled alternation scan instead of a regex per pattern
+        if match_greeting(text_lower):
+            return True, get_message("greeting_short")
     # For non-English input, translate each greeting pattern and check
     else:
         # Option 1: Check if the input starts with common greetings in their language
@@ -64,33 +84,13 @@ def is_restaurant_related(text: str) -> Tuple[bool, str]:
             # Translate the greeting response
             return True, get_message("greeting_short", language)
     
-    # Simple keyword matching to detect food-related queries
-    food_drink_keywords = {
-        # English food keywords
-        "food", "eat", "restaurant", "dining", "meal", "lunch", "dinner", "breakfast", "brunch",
-        "cuisine", "menu", "dishes", "snack", "street food", "take out", "takeaway", "delivery",
-        # English drink keywords
-        "drink", "coffee", "cafe", "tea", "bubble tea", "boba", "milk tea", "juice", "bar", 
-        "alcohol", "beer", "wine", "cocktail", "beverage",
-        # English dessert/bakery keywords
-        "dessert", "cake", "ice cream", "sweet", "bakery", "pastry", "bread",
-        # Chinese food keywords
-        "食物", "吃", "餐廳", "用餐", "餐點", "午餐", "晚餐", "早餐", "早午餐", 
-        "菜系", "菜單", "菜色", "小吃", "路邊攤", "外帶", "外送",
-        # Chinese drink keywords
-        "飲料", "咖啡", "茶", "珍珠奶茶", "手搖杯", "果汁", "酒吧", 
-        "酒", "啤酒", "葡萄酒", "調酒", "飲品",
-        # Chinese dessert/bakery keywords
-        "甜點", "蛋糕", "冰淇淋", "甜食", "麵包店", "糕點", "麵包"
-    }
-    
     # Check if any food/drink keyword is in the text
-    for keyword in food_drink_keywords:
+    for keyword in FOOD_DRINK_KEYWORDS:
         if keyword in text_lower:
             return True, ""
-    
+
     # Use ChatGPT with function calling for more accurate intent classification
-    if os.getenv("USE_AI_PARSING", "False").lower() == "true":
+    if USE_AI_PARSING:
         try:
             # Get system prompt and functions from language pack
             system_prompt = get_system_prompt("restaurant_intent")
@@ -133,15 +133,13 @@ def is_restaurant_related(text: str) -> Tuple[bool, str]:
             print(f"Error using OpenAI API for intent detection: {str(e)}")
             # Fall back to simpler checks if AI check fails
     
-    # Simple keyword matching for non-food/drink queries as fallback
-    # Define English non-food/drink keywords only
-    non_restaurant_keywords = get_non_restaurant_keywords()
-    
+    # Simple keyword matching for non-food/drink queries as fallback,
+    # using the precompiled alternation (English keywords only)
     # For English input, check against English keywords
     if language == 'en':
-        for keyword in non_restaurant_keywords:
-            if keyword in text_lower:
-                return False, get_message("non_restaurant_query", language, query_type=keyword)
+        keyword = find_non_restaurant_keyword(text_lower)
+        if keyword:
+            return False, get_message("non_restaurant_query", language, query_type=keyword)
     # For non-English input, translate the input text to English and check against English keywords
     else:
         # This approach might be less accurate but avoids translating many keywords
@@ -154,11 +152,11 @@ def is_restaurant_related(text: str) -> Tuple[bool, str]:
             print(f"Error translating input to English: {str(e)}")
             # If translation fails, skip this check
             pass
-        
+
         if translated_text_to_en:
-            for keyword in non_restaurant_keywords:
-                if keyword in translated_text_to_en:
-                    return False, get_message("non_restaurant_query", language, query_type=keyword)
+            keyword = find_non_restaurant_keyword(translated_text_to_en)
+            if keyword:
+                return False, get_message("non_restaurant_query", language, query_type=keyword)
     
     # Default to assuming it's food/drink-related if no other conditions matched
     return True, ""